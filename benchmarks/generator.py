@@ -0,0 +1,204 @@
+"""
+Deterministic generator of large synthetic org documents.
+
+The same `CorpusConfig` (including its seed) always produces the same text, so
+timings taken on different commits are comparable. All the generated documents
+can be loaded with `extra_cautious=True`.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Iterator, List
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+WORDS = [
+    "lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing",
+    "elit", "sed", "do", "eiusmod", "tempor", "incididunt", "ut", "labore",
+    "et", "dolore", "magna", "aliqua", "enim", "minim", "veniam", "quis",
+    "nostrud", "exercitation", "ullamco", "laboris", "nisi", "aliquip",
+]
+TAGS = ["work", "home", "project", "idea", "reading", "urgent", "someday"]
+MARKERS = ["*", "/", "_", "=", "~", "+"]
+LANGUAGES = ["python", "shell", "elisp", "c"]
+
+
+@dataclass
+class CorpusConfig:
+    seed: int = 42
+    top_headlines: int = 40
+    max_depth: int = 4
+    children_per_headline: int = 3
+    properties_per_headline: int = 8
+    paragraphs_per_headline: int = 2
+    list_items_per_headline: int = 12
+    max_list_depth: int = 4
+    table_rows_per_headline: int = 6
+    src_blocks_per_headline: int = 1
+
+    def as_dict(self):
+        return asdict(self)
+
+
+# Presets, from a quick smoke-test to a deep and heavy document
+PRESETS = {
+    "small": CorpusConfig(top_headlines=5, max_depth=2, children_per_headline=2),
+    "medium": CorpusConfig(),
+    "large": CorpusConfig(top_headlines=100, max_depth=4),
+    "deep": CorpusConfig(top_headlines=4, max_depth=9, children_per_headline=2,
+                         list_items_per_headline=4, table_rows_per_headline=2),
+    "long-lists": CorpusConfig(top_headlines=10, max_depth=1, list_items_per_headline=2000,
+                               paragraphs_per_headline=0, table_rows_per_headline=0,
+                               src_blocks_per_headline=0),
+    "nested-lists": CorpusConfig(top_headlines=4, max_depth=1, list_items_per_headline=5000,
+                                 max_list_depth=12, paragraphs_per_headline=0,
+                                 table_rows_per_headline=0, src_blocks_per_headline=0),
+}
+
+
+class Generator:
+    def __init__(self, config: CorpusConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.counter = 0
+
+    ## Inline elements
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def timestamp(self, active: bool = True, with_time: bool = False) -> str:
+        day = date(2020, 1, 1) + timedelta(days=self.rng.randrange(0, 3 * 365))
+        value = "{} {}".format(day.isoformat(), WEEKDAYS[day.weekday()])
+        if with_time:
+            value += " {:02d}:{:02d}".format(self.rng.randrange(24), self.rng.randrange(60))
+        return ("<{}>" if active else "[{}]").format(value)
+
+    def link(self) -> str:
+        self.counter += 1
+        kind = self.rng.randrange(3)
+        if kind == 0:
+            return "[[https://example.com/page/{}][{}]]".format(self.counter, self.words(2))
+        if kind == 1:
+            return "[[id:generated-{}][{}]]".format(self.rng.randrange(self.counter), self.words(1))
+        return "[[file:notes-{}.org]]".format(self.rng.randrange(100))
+
+    def rich_text(self, words: int) -> str:
+        chunks = []
+        for _ in range(words):
+            roll = self.rng.random()
+            if roll < 0.08:
+                marker = self.rng.choice(MARKERS)
+                chunks.append("{m}{text}{m}".format(m=marker, text=self.words(2)))
+            elif roll < 0.12:
+                chunks.append(self.link())
+            elif roll < 0.14:
+                chunks.append(self.timestamp(active=self.rng.random() < 0.5))
+            elif roll < 0.15:
+                chunks.append("https://example.org/implicit/{}".format(self.rng.randrange(1000)))
+            else:
+                chunks.append(self.rng.choice(WORDS))
+        return " ".join(chunks)
+
+    ## Block elements
+    def headline(self, depth: int) -> Iterator[str]:
+        config = self.config
+        self.counter += 1
+        state = self.rng.choice(["TODO ", "DONE ", "NEXT ", "", ""])
+        title = self.rich_text(5)
+        tags = ""
+        if self.rng.random() < 0.5:
+            tags = " :" + ":".join(self.rng.sample(TAGS, self.rng.randrange(1, 3))) + ":"
+        yield "{} {}{}{}".format("*" * depth, state, title, tags)
+
+        planning = []
+        if self.rng.random() < 0.5:
+            planning.append("SCHEDULED: " + self.timestamp())
+        if self.rng.random() < 0.3:
+            planning.append("DEADLINE: " + self.timestamp(with_time=True))
+        if state == "DONE ":
+            planning.append("CLOSED: " + self.timestamp(active=False, with_time=True))
+        if planning:
+            yield " ".join(planning)
+
+        yield ":PROPERTIES:"
+        yield ":ID:       generated-{}".format(self.counter)
+        yield ":CREATED:  {}".format(self.timestamp(active=False, with_time=True))
+        for i in range(config.properties_per_headline - 2):
+            yield ":PROP_{}:   {}".format(i, self.words(self.rng.randrange(1, 4)))
+        yield ":END:"
+        yield ""
+
+        for _ in range(config.paragraphs_per_headline):
+            for _ in range(self.rng.randrange(1, 5)):
+                yield self.rich_text(12)
+            yield ""
+
+        if config.list_items_per_headline:
+            yield from self.list_lines(config.list_items_per_headline)
+            yield ""
+
+        if config.table_rows_per_headline:
+            yield from self.table_lines(config.table_rows_per_headline)
+            yield ""
+
+        for _ in range(config.src_blocks_per_headline):
+            yield from self.src_block()
+            yield ""
+
+        if depth < config.max_depth:
+            for _ in range(config.children_per_headline):
+                yield from self.headline(depth + 1)
+
+    def list_lines(self, items: int) -> Iterator[str]:
+        level = 0
+        for i in range(items):
+            roll = self.rng.random()
+            if roll < 0.3 and level < self.config.max_list_depth:
+                level += 1
+            elif roll < 0.5 and level > 0:
+                level -= 1
+            indentation = "  " * level
+            bullet = self.rng.choice(["-", "+", "{}.".format(i % 9 + 1)])
+            checkbox = "[ ] " if self.rng.random() < 0.2 else ""
+            yield "{}{} {}{}".format(indentation, bullet, checkbox, self.rich_text(8))
+
+    def table_lines(self, rows: int) -> Iterator[str]:
+        columns = self.rng.randrange(2, 6)
+        yield "| " + " | ".join("Header{}".format(c) for c in range(columns)) + " |"
+        yield "|" + "+".join("-" * 9 for _ in range(columns)) + "|"
+        for _ in range(rows):
+            yield "| " + " | ".join(self.words(1) for _ in range(columns)) + " |"
+
+    def src_block(self) -> Iterator[str]:
+        language = self.rng.choice(LANGUAGES)
+        yield "#+BEGIN_SRC {} :tangle out/{}-{}.txt".format(language, language, self.rng.randrange(10))
+        for i in range(self.rng.randrange(3, 15)):
+            yield "line_{} = {!r}".format(i, self.words(3))
+        yield "#+END_SRC"
+        yield ""
+        yield "#+RESULTS:"
+        yield ": " + self.words(4)
+
+    def document(self) -> str:
+        lines = [
+            "#+TITLE: Synthetic corpus {}".format(self.config.seed),
+            "#+TODO: TODO NEXT | DONE",
+            "",
+        ]
+        for _ in range(self.config.top_headlines):
+            lines.extend(self.headline(1))
+        return "\n".join(lines)
+
+
+def generate(config: CorpusConfig) -> str:
+    """Generate a single synthetic document."""
+    return Generator(config).document()
+
+
+def generate_corpus(config: CorpusConfig, documents: int) -> List[str]:
+    """Generate `documents` different documents, seeded from the `config` one."""
+    result = []
+    for i in range(documents):
+        doc_config = CorpusConfig(**{**config.as_dict(), "seed": config.seed + i})
+        result.append(generate(doc_config))
+    return result
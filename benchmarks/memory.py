@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Track the memory retained by parsed documents, per source byte.
+
+    python -m benchmarks.memory --output memory.json
+    python -m benchmarks.memory --compare memory.json
+
+When `--compare` is given the run fails if the bytes per source byte of any
+preset grow by more than `--threshold` over the baseline.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import org_rw
+from org_rw.memory import memory_report
+
+from .generator import PRESETS, generate
+
+
+def run(presets):
+    results = {}
+    for name in presets:
+        source = generate(PRESETS[name])
+        doc = org_rw.loads(source, extra_cautious=False)
+        results[name] = memory_report(doc, source_size=len(source)).as_dict()
+    return {"timestamp": time.time(), "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS),
+                        help="Preset to measure (can be repeated, default: small and medium)")
+    parser.add_argument("--output", help="Write the JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed growth ratio against the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    results = run(args.preset or ["small", "medium"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    for name, result in results["results"].items():
+        print("{:<12} {:>12} bytes  {:.2f} bytes/source byte".format(
+            name, result["total"], result["bytes_per_source_byte"]), file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        failed = False
+        for name, result in results["results"].items():
+            if name not in baseline:
+                continue
+            before = baseline[name]["bytes_per_source_byte"]
+            after = result["bytes_per_source_byte"]
+            if (after - before) / before > args.threshold:
+                print("Regression on {}: {:.2f} -> {:.2f} bytes/source byte".format(name, before, after),
+                      file=sys.stderr)
+                failed = True
+        if failed:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
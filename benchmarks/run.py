@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Time the main operations of org_rw over synthetic documents.
+
+    python -m benchmarks.run --preset medium --output results.json
+    python -m benchmarks.run --preset medium --compare baseline.json
+
+Results are written as JSON. When `--compare` is given the run fails if any
+benchmark is slower than the baseline by more than `--threshold`.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import org_rw
+
+from .generator import PRESETS, CorpusConfig, generate
+
+
+def measure(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "repeat": repeat,
+    }
+
+
+def all_headlines(doc):
+    return list(doc.getAllHeadlines())
+
+
+def cold(headlines, method: Callable) -> Callable[[], object]:
+    """Call `method` on all the headlines, dropping their caches first."""
+    def run():
+        for hl in headlines:
+            hl._touch()
+            method(hl)
+    return run
+
+
+def uncached_links(headline):
+    """Links of `headline`, dropping the ones kept on its texts and list items."""
+    for content in headline.contents:
+        content._touch()
+    for item in headline.list_items:
+        item._touch()
+    return list(headline.get_links())
+
+
+def build_benchmarks(doc, source: str) -> Dict[str, Callable[[], object]]:
+    headlines = all_headlines(doc)
+
+    return {
+        "loads": lambda: org_rw.loads(source, extra_cautious=False),
+        "loads_extra_cautious": lambda: org_rw.loads(source, extra_cautious=True),
+        "loads_outline": lambda: org_rw.outline.loads_outline(source),
+        "dumps": lambda: org_rw.dumps(doc),
+        "tokenize_contents": lambda: org_rw.tokenize_contents(source),
+        "as_dom": cold(headlines, lambda hl: hl.as_dom()),
+        "as_dom_cached": lambda: [hl.as_dom() for hl in headlines],
+        "get_links": cold(headlines, uncached_links),
+        "get_links_cached": lambda: [list(hl.get_links()) for hl in headlines],
+        "get_code_snippets": cold(headlines, lambda hl: hl.get_code_snippets()),
+        "code_snippet_index": lambda: (doc._touch(), doc.get_code_snippet_index()),
+    }
+
+
+def run(config: CorpusConfig, repeat: int, only: Optional[List[str]] = None) -> Dict:
+    source = generate(config)
+    doc = org_rw.loads(source, extra_cautious=False)
+    benchmarks = build_benchmarks(doc, source)
+
+    results = {}
+    for name, function in benchmarks.items():
+        if only and name not in only:
+            continue
+        results[name] = measure(function, repeat)
+
+    return {
+        "corpus": {
+            **config.as_dict(),
+            "bytes": len(source),
+            "lines": source.count("\n") + 1,
+            "headlines": len(all_headlines(doc)),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "timestamp": time.time(),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline.get("results", {}):
+            continue
+        before = baseline["results"][name]["min"]
+        after = result["min"]
+        if before > 0 and (after - before) / before > threshold:
+            regressions.append(
+                "{}: {:.4f}s -> {:.4f}s (+{:.0%})".format(name, before, after, (after - before) / before)
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", help="Run only this benchmark (can be repeated)")
+    parser.add_argument("--output", help="Write the JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown ratio against the baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    # Avoid measuring the (repeated) warnings on unsupported elements
+    logging.getLogger().setLevel(logging.ERROR)
+
+    config = PRESETS[args.preset]
+    if args.seed is not None:
+        config = CorpusConfig(**{**config.as_dict(), "seed": args.seed})
+
+    results = run(config, args.repeat, args.only)
+    results["preset"] = args.preset
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    for name, result in results["results"].items():
+        print("{:<24} min {:.4f}s  median {:.4f}s".format(name, result["min"], result["median"]),
+              file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions found:", file=sys.stderr)
+            for regression in regressions:
+                print("  " + regression, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
 from . import dom
+from . import aio, memory, outline, query, stats
 from .org_rw import *
 from .utils import *
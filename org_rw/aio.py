@@ -0,0 +1,88 @@
+"""
+asyncio front-end for loading and saving documents.
+
+    doc = await aload("notes.org")
+    docs = await aload_many(paths, limit=8)
+    await adump(doc, "notes.org")
+
+File reads and writes go to the event loop's default executor, while parsing
+and serialization run on the `executor` passed (by default, also the loop's
+default one), so the event loop is never blocked.
+
+Note that documents can't be pickled, so `executor` must be a thread pool, not
+a process pool.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor
+from typing import Iterable, List, Optional
+
+from .org_rw import BASE_ENVIRONMENT, OrgDoc, dumps, loads
+
+
+def _read_file(path, encoding) -> str:
+    with open(path, encoding=encoding) as f:
+        return f.read()
+
+
+def _write_file(path, contents, encoding):
+    with open(path, "w", encoding=encoding) as f:
+        f.write(contents)
+
+
+async def aloads(s: str, environment=BASE_ENVIRONMENT, extra_cautious=True,
+                 *, executor: Optional[Executor] = None) -> OrgDoc:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(loads, s, environment, extra_cautious)
+    )
+
+
+async def aload(path, environment=BASE_ENVIRONMENT, extra_cautious=False,
+                *, executor: Optional[Executor] = None, encoding: Optional[str] = None) -> OrgDoc:
+    loop = asyncio.get_running_loop()
+    contents = await loop.run_in_executor(None, _read_file, path, encoding)
+    doc = await aloads(contents, environment, extra_cautious, executor=executor)
+    doc._path = os.path.abspath(path)
+    return doc
+
+
+async def adumps(doc: OrgDoc, *, executor: Optional[Executor] = None) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, dumps, doc)
+
+
+async def adump(doc: OrgDoc, path, *, executor: Optional[Executor] = None,
+                encoding: Optional[str] = None):
+    contents = await adumps(doc, executor=executor)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _write_file, path, contents, encoding)
+
+
+async def aload_many(paths: Iterable, environment=BASE_ENVIRONMENT, extra_cautious=False,
+                     *, limit: int = 8, executor: Optional[Executor] = None,
+                     encoding: Optional[str] = None, return_exceptions=False) -> List:
+    """
+    Load many files, with at most `limit` of them in progress at a time.
+
+    Results are returned in the same order as `paths`. If `return_exceptions`
+    is set, failures are returned in place of their document instead of
+    cancelling the rest of the loads. Cancelling this coroutine cancels all the
+    loads that are still pending.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def load_one(path):
+        async with semaphore:
+            return await aload(path, environment, extra_cautious,
+                               executor=executor, encoding=encoding)
+
+    tasks = [asyncio.ensure_future(load_one(path)) for path in paths]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,209 @@
+"""
+Write large documents in a single pass, without building them in memory.
+
+    with open("report.org", "w") as f, DocumentBuilder(f) as builder:
+        builder.keyword("TITLE", "Report")
+        for entry in entries:
+            builder.headline(entry.name, state="TODO", tags=["report"],
+                             scheduled=entry.date)
+            builder.set_property("ID", entry.id)
+            builder.text(entry.summary)
+            builder.list_items(entry.notes)
+            builder.table(entry.rows, header=True)
+
+Everything is appended at the end of the document. The properties and
+planning of a headline can be set until its body (or the next headline)
+starts, after that it's written out. Output is buffered and written to the
+file in chunks. The result loads back with `load`.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Union
+
+from .org_rw import OrgTime, TimeRange, Timestamp, timestamp_to_string
+
+TimeValue = Union[OrgTime, TimeRange, datetime, date, str]
+
+DAYS_OF_WEEK = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+class BuilderError(Exception):
+    """
+    Exception thrown when something can't be added at the current position
+    of a `DocumentBuilder`.
+    """
+    pass
+
+
+def format_time(value: TimeValue) -> str:
+    if isinstance(value, (OrgTime, TimeRange)):
+        return value.to_raw()
+    if isinstance(value, datetime):
+        return timestamp_to_string(Timestamp(
+            True, value.year, value.month, value.day, DAYS_OF_WEEK[value.weekday()],
+            value.hour, value.minute,
+        ))
+    if isinstance(value, date):
+        return timestamp_to_string(Timestamp(
+            True, value.year, value.month, value.day, DAYS_OF_WEEK[value.weekday()],
+            None, None,
+        ))
+    return value
+
+
+def _check_line(value: str) -> str:
+    if "\n" in value:
+        raise BuilderError("Value can't span multiple lines: {!r}".format(value))
+    return value
+
+
+class DocumentBuilder:
+    def __init__(self, fp: TextIO, buffer_size: int = 1 << 16):
+        self._fp = fp
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._buffer_size = buffer_size
+
+        # Headline (or document start) whose properties and planning can
+        # still be changed
+        self._pending = True
+        self._pending_line: Optional[str] = None
+        self._planning: Dict[str, str] = {}
+        self._properties: Dict[str, str] = {}
+        self._indentation = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+
+    def _write(self, line: str):
+        self._buffer.append(line)
+        self._buffer.append("\n")
+        self._buffered += len(line) + 1
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        self._fp.write("".join(self._buffer))
+        self._buffer = []
+        self._buffered = 0
+
+    def _close_pending(self):
+        if not self._pending:
+            return
+        self._pending = False
+
+        indentation = self._indentation
+        if self._pending_line is not None:
+            self._write(self._pending_line)
+        if self._planning:
+            self._write(indentation + " ".join(
+                "{}: {}".format(key, self._planning[key])
+                for key in ("SCHEDULED", "CLOSED", "DEADLINE")
+                if key in self._planning
+            ))
+        if self._properties:
+            self._write(indentation + ":PROPERTIES:")
+            for key, value in self._properties.items():
+                self._write("{}:{}: {}".format(indentation, key, value))
+            self._write(indentation + ":END:")
+
+    def finish(self):
+        """Write everything still pending."""
+        self._close_pending()
+        self.flush()
+
+    ## Headlines
+    def headline(self, title: str, depth: int = 1, *, state: Optional[str] = None,
+                 tags: Iterable[str] = (), scheduled: Optional[TimeValue] = None,
+                 deadline: Optional[TimeValue] = None, closed: Optional[TimeValue] = None,
+                 properties: Optional[Dict[str, str]] = None):
+        """Start a new headline, after the current one."""
+        if depth < 1:
+            raise BuilderError("Headlines depth starts on 1, found: {}".format(depth))
+        self._close_pending()
+
+        line = "*" * depth + " "
+        if state:
+            line += state + " "
+        line += _check_line(title)
+        tags = list(tags)
+        if tags:
+            if not title.endswith((" ", "\t")):
+                line += " "
+            line += ":" + ":".join(tags) + ":"
+
+        self._pending = True
+        self._pending_line = line
+        self._planning = {}
+        self._properties = {}
+        self._indentation = " " * (depth + 1)
+
+        for key, value in (("SCHEDULED", scheduled), ("CLOSED", closed), ("DEADLINE", deadline)):
+            if value is not None:
+                self._planning[key] = _check_line(format_time(value))
+        for key, value in (properties or {}).items():
+            self.set_property(key, value)
+
+    def set_property(self, name: str, value: str):
+        """
+        Set a property of the current headline or, before the first one, of
+        the document.
+        """
+        if not self._pending:
+            raise BuilderError("Properties must be set before the body starts")
+        self._properties[_check_line(name)] = _check_line(str(value))
+
+    def set_planning(self, *, scheduled: Optional[TimeValue] = None,
+                     deadline: Optional[TimeValue] = None, closed: Optional[TimeValue] = None):
+        if not self._pending or self._pending_line is None:
+            raise BuilderError("Planning must be set on a headline before its body starts")
+        for key, value in (("SCHEDULED", scheduled), ("CLOSED", closed), ("DEADLINE", deadline)):
+            if value is not None:
+                self._planning[key] = _check_line(format_time(value))
+
+    ## Body
+    def keyword(self, key: str, value: str):
+        self._close_pending()
+        self._write("{}#+{}: {}".format(self._indentation, key, _check_line(value)))
+
+    def text(self, text: str):
+        """Add lines of text, indented to the current headline."""
+        self._close_pending()
+        indentation = self._indentation
+        for line in text.split("\n"):
+            self._write(indentation + line if line else "")
+
+    def list_items(self, items: Iterable[str], ordered: bool = False):
+        self._close_pending()
+        indentation = self._indentation
+        for i, item in enumerate(items):
+            bullet = "{}.".format(i + 1) if ordered else "-"
+            self._write("{}{} {}".format(indentation, bullet, _check_line(item)))
+
+    def table(self, rows: Sequence[Sequence[str]], header: bool = False):
+        """
+        Add a table, with its columns aligned. If `header` is set the first
+        row is separated from the rest.
+        """
+        self._close_pending()
+        if len(rows) == 0:
+            return
+
+        rows = [[_check_line(str(cell)).replace("|", "\\vert{}") for cell in row] for row in rows]
+        columns = max(len(row) for row in rows)
+        widths = [0] * columns
+        for row in rows:
+            for i, cell in enumerate(row):
+                widths[i] = max(widths[i], len(cell))
+
+        indentation = self._indentation
+        for i, row in enumerate(rows):
+            cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+            cells += [" " * width for width in widths[len(row):]]
+            self._write(indentation + "| " + " | ".join(cells) + " |")
+            if header and i == 0:
+                self._write(indentation + "|-" + "-+-".join("-" * width for width in widths) + "-|")
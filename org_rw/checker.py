@@ -0,0 +1,163 @@
+"""
+Check that a corpus of org files can be loaded and saved back unchanged.
+
+    org-rw-check ~/org --jobs 8 --slowest 20 --json report.json
+    org-rw-check ~/org --since 1d
+
+Files are checked on a process pool. Failures don't stop the run, they are
+all reported at the end (and make the command exit with status 1).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from .org_rw import dumps, loads
+
+SINCE_RE = re.compile(r"^(?P<value>\d+(\.\d+)?)(?P<unit>[smhdw])$")
+SINCE_UNITS = {
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+}
+
+
+class FileResult(NamedTuple):
+    path: str
+    size: int
+    parse_seconds: float
+    roundtrip_seconds: float
+    error: Optional[str]
+
+    @property
+    def seconds(self) -> float:
+        return self.parse_seconds + self.roundtrip_seconds
+
+
+def check_file(path: str) -> FileResult:
+    """Load `path` and check that dumping it produces the same contents."""
+    parse_seconds = roundtrip_seconds = 0.0
+    size = 0
+    try:
+        with open(path) as f:
+            contents = f.read()
+        size = len(contents)
+
+        start = time.perf_counter()
+        doc = loads(contents, extra_cautious=False)
+        parse_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dumped = dumps(doc)
+        roundtrip_seconds = time.perf_counter() - start
+
+        if dumped != contents:
+            return FileResult(path, size, parse_seconds, roundtrip_seconds,
+                              "NonReproducibleDocument: dumped contents differ from the original")
+    except Exception as err:
+        return FileResult(path, size, parse_seconds, roundtrip_seconds,
+                          "".join(traceback.format_exception_only(type(err), err)).strip())
+
+    return FileResult(path, size, parse_seconds, roundtrip_seconds, None)
+
+
+def parse_since(value: str) -> float:
+    """
+    Convert a `--since` value (a duration like `12h` or `2d`, or an ISO date)
+    to a timestamp.
+    """
+    if m := SINCE_RE.match(value):
+        return time.time() - float(m.group("value")) * SINCE_UNITS[m.group("unit")]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def find_files(paths: Iterable[str], since: Optional[float] = None) -> Iterator[str]:
+    for top in paths:
+        if os.path.isfile(top):
+            candidates: Iterable[str] = [top]
+        else:
+            candidates = (
+                os.path.join(root, name)
+                for root, dirs, files in sorted(os.walk(top))
+                for name in sorted(files)
+                if ".org" in name
+            )
+
+        for path in candidates:
+            if since is not None and os.stat(path).st_mtime < since:
+                continue
+            yield path
+
+
+def check_files(paths: List[str], jobs: Optional[int] = None) -> Iterator[FileResult]:
+    if jobs == 1:
+        yield from map(check_file, paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunksize = max(1, min(64, len(paths) // ((jobs or os.cpu_count() or 1) * 4)))
+        yield from executor.map(check_file, paths, chunksize=chunksize)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Files or directories to check")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of worker processes (default: one per CPU)")
+    parser.add_argument("--slowest", type=int, default=10, help="Number of slowest files to report")
+    parser.add_argument("--since", help="Only check files modified after this (like `12h`, `2d` or `2021-01-01`)")
+    parser.add_argument("--json", help="Write a machine-readable report to this file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Don't print the failure details")
+    args = parser.parse_args(argv)
+
+    since = parse_since(args.since) if args.since else None
+    paths = list(find_files(args.paths, since))
+
+    start = time.perf_counter()
+    results = list(check_files(paths, args.jobs))
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if result.error is not None]
+    slowest = sorted(results, key=lambda result: result.seconds, reverse=True)[:args.slowest]
+
+    if slowest:
+        print("Slowest files:")
+        for result in slowest:
+            print("  {:8.3f}s (parse {:.3f}s, dump {:.3f}s)  {}".format(
+                result.seconds, result.parse_seconds, result.roundtrip_seconds, result.path))
+
+    if failures:
+        print("Failures:")
+        for result in failures:
+            print("  == On {}".format(result.path))
+            if not args.quiet and result.error is not None:
+                print("     " + result.error.replace("\n", "\n     "))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "files": len(results),
+                "failures": len(failures),
+                "seconds": elapsed,
+                "results": [result._asdict() for result in results],
+            }, f, indent=2)
+
+    if failures:
+        print("[FAIL] {} of {} files failed ({:.2f}s)".format(len(failures), len(results), elapsed))
+        return 1
+
+    print("[OK] Check passed on {} files ({:.2f}s)".format(len(results), elapsed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
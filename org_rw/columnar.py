@@ -0,0 +1,168 @@
+"""
+Columnar export of the headlines of a document, for vectorized analytics.
+
+    table = to_columns(doc)
+    table.depth, table.scheduled       # array.array or numpy arrays
+    pandas.DataFrame(table.to_dict())
+
+Numeric columns are backed by `array.array` or, if available (and not
+disabled with `use_numpy=False`), by numpy arrays sharing the same buffer.
+Timestamps are stored as minutes since the (naive) UNIX epoch, with `NO_TIME`
+marking the missing ones. Strings are interned: titles directly, states and
+tags through a dictionary of values and integer codes.
+"""
+
+import array
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from .org_rw import Headline, OrgDoc, OrgTime, TimeRange
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is optional
+    numpy = None
+
+NO_TIME = -(2 ** 63)
+NO_STATE = -1
+NO_PARENT = -1
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+# Column name -> array.array typecode
+NUMERIC_COLUMNS = {
+    "depth": "i",
+    "start_line": "q",
+    "parent": "q",
+    "state": "i",
+    "is_todo": "B",
+    "is_done": "B",
+    "scheduled": "q",
+    "deadline": "q",
+    "closed": "q",
+    "tag_offsets": "q",
+    "tag_codes": "i",
+}
+
+NUMPY_TYPES = {
+    "i": "int32",
+    "q": "int64",
+    "B": "uint8",
+}
+
+
+def epoch_minutes(value) -> int:
+    if isinstance(value, OrgTime):
+        when = value.time.to_datetime()
+    elif isinstance(value, TimeRange):
+        when = value.start
+    else:
+        return NO_TIME
+    return (when - EPOCH) // MINUTE
+
+
+class HeadlineTable:
+    """
+    One row per headline, in `getAllHeadlines()` order.
+
+    The tags of the headline on row `i` are
+    `tag_codes[tag_offsets[i]:tag_offsets[i + 1]]`, as codes of `tag_values`.
+    """
+
+    def __init__(self):
+        self.columns: Dict = {name: array.array(code) for name, code in NUMERIC_COLUMNS.items()}
+        self.title: List[str] = []
+        self.states: List[str] = []
+        self.tag_values: List[str] = []
+        self._state_codes: Dict[str, int] = {}
+        self._tag_codes: Dict[str, int] = {}
+        self.columns["tag_offsets"].append(0)
+
+    def __len__(self):
+        return len(self.title)
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def _code(self, codes: Dict[str, int], values: List[str], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(sys.intern(value))
+        return code
+
+    def append(self, headline: Headline, parent: int):
+        columns = self.columns
+        columns["depth"].append(headline.depth)
+        columns["start_line"].append(headline.start_line)
+        columns["parent"].append(parent)
+        if headline.state:
+            columns["state"].append(self._code(self._state_codes, self.states, headline.state))
+        else:
+            columns["state"].append(NO_STATE)
+        columns["is_todo"].append(1 if headline.is_todo else 0)
+        columns["is_done"].append(1 if headline.is_done else 0)
+        columns["scheduled"].append(epoch_minutes(headline.scheduled))
+        columns["deadline"].append(epoch_minutes(headline.deadline))
+        columns["closed"].append(epoch_minutes(headline.closed))
+
+        for tag in headline.shallow_tags:
+            columns["tag_codes"].append(self._code(self._tag_codes, self.tag_values, tag))
+        columns["tag_offsets"].append(len(columns["tag_codes"]))
+
+        self.title.append(sys.intern(headline.title.get_text().strip()))
+
+    def to_numpy(self):
+        if numpy is None:
+            raise ImportError("NumPy is not installed")
+        for name, column in self.columns.items():
+            if isinstance(column, array.array):
+                self.columns[name] = numpy.frombuffer(column, dtype=NUMPY_TYPES[column.typecode])
+
+    def tags(self, row: int) -> List[str]:
+        offsets = self.columns["tag_offsets"]
+        codes = self.columns["tag_codes"][offsets[row]:offsets[row + 1]]
+        return [self.tag_values[code] for code in codes]
+
+    def to_dict(self) -> Dict:
+        """Mapping of one entry per row, as accepted by `pandas.DataFrame`."""
+        result = {
+            name: self.columns[name]
+            for name in NUMERIC_COLUMNS
+            if name not in ("tag_offsets", "tag_codes")
+        }
+        result["state"] = [
+            self.states[code] if code != NO_STATE else None
+            for code in self.columns["state"]
+        ]
+        result["title"] = self.title
+        result["tags"] = [self.tags(row) for row in range(len(self))]
+        return result
+
+
+def to_columns(doc: OrgDoc, use_numpy: Optional[bool] = None) -> HeadlineTable:
+    """
+    Walk all the headlines of `doc` once and store them as columns.
+
+    `use_numpy` forces (`True`) or disables (`False`) the conversion to numpy
+    arrays. By default it's done only if numpy is available.
+    """
+    table = HeadlineTable()
+    positions: Dict[int, int] = {}
+
+    for row, headline in enumerate(doc.getAllHeadlines()):
+        positions[id(headline)] = row
+        if isinstance(headline.parent, Headline):
+            parent = positions[id(headline.parent)]
+        else:
+            parent = NO_PARENT
+        table.append(headline, parent)
+
+    if use_numpy or (use_numpy is None and numpy is not None):
+        table.to_numpy()
+    return table
@@ -1,4 +1,5 @@
-from typing import List, Optional, Union
+from enum import Enum
+from typing import Iterable, List, Optional, Tuple, Union
 
 
 class DrawerNode:
@@ -122,4 +123,33 @@ ContainerDomNode = Union[DrawerNode,
                          BlockNode,
                          ]
 
+
+class DomEvent(Enum):
+    ENTER = 1
+    LEAVE = 2
+    LEAF = 3
+
+
+def build_tree(events: Iterable[Tuple[DomEvent, DomNode]]) -> List[DomNode]:
+    """
+    Fold a stream of `(event, node)` pairs (like the ones from
+    `Headline.iter_dom()`) into a tree.
+    """
+    tree: List[DomNode] = []
+    stack: List[ContainerDomNode] = []
+    for event, node in events:
+        if event == DomEvent.LEAVE:
+            stack.pop()
+            continue
+
+        if len(stack) > 0:
+            stack[-1].append(node)
+        else:
+            tree.append(node)
+
+        if event == DomEvent.ENTER:
+            assert isinstance(node, (DrawerNode, ListGroupNode, TableNode, BlockNode))
+            stack.append(node)
+    return tree
+
 from .utils import get_raw_contents
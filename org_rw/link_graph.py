@@ -0,0 +1,209 @@
+"""
+Graph of the links between documents and headlines of a corpus, for
+backlinks (like org-roam's) and neighbourhood queries.
+
+    graph = load_link_graph(["~/org"])
+    graph.backlinks("id:419f4651-21c8-4166-b8d5-692c34be9f93")
+    graph.neighbourhood("id:419f4651-21c8-4166-b8d5-692c34be9f93", hops=2)
+
+    graph.add_document(path, doc)   # After the file changes
+
+Nodes are strings:
+- Headlines with an `ID` are `id:<ID>`. Links on headlines without one belong
+  to their closest ancestor with an ID or, if there's none, to the document.
+- Documents are `id:<ID>` if they have a file-level `ID` property, or
+  `file:<absolute path>` if not. `file:` links to a document with an ID are
+  counted as links to its `id:` node.
+- `file:` link targets are made absolute and lose their search option
+  (`file:notes.org::*Heading` -> `file:/home/user/notes.org`). Other targets
+  are kept as they are.
+"""
+
+import collections
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Counter, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .checker import find_files
+from .org_rw import Headline, OrgDoc, get_links_from_content, load, parse_content_block
+
+
+class DocumentEdges(NamedTuple):
+    path: str
+    # Node of the document itself, and its `file:` node if it's different
+    node: str
+    alias: Optional[str]
+    edges: List[Tuple[str, str]]
+
+
+def file_node(path: str) -> str:
+    return "file:" + os.path.abspath(path)
+
+
+def normalize_target(value: str, base_dir: Optional[str]) -> str:
+    if value.startswith("file:"):
+        target = value[len("file:"):].split("::", 1)[0]
+        target = os.path.expanduser(target)
+        if base_dir is not None:
+            target = os.path.join(base_dir, target)
+        return file_node(target)
+    return value
+
+
+def document_edges(doc: OrgDoc, path: Optional[str] = None) -> DocumentEdges:
+    """
+    Links of `doc`, as `(source node, target node)` pairs. `path` is required
+    for documents not loaded from a file, as it identifies them on the graph.
+    """
+    path = path or doc.path
+    if path is None:
+        raise ValueError("A path is needed for documents not loaded from a file")
+    path = os.path.abspath(path)
+    base_dir = os.path.dirname(path)
+    alias = None
+    node = file_node(path)
+    if doc.id:
+        alias = node
+        node = "id:" + doc.id
+
+    edges = []
+    for content in doc.contents:
+        for link in get_links_from_content(parse_content_block([content])):
+            edges.append((node, normalize_target(link.value, base_dir)))
+
+    pending: List[Tuple[Headline, str]] = [(hl, node) for hl in reversed(doc.headlines)]
+    while pending:
+        headline, parent_node = pending.pop()
+        hl_id = headline.id
+        source = "id:" + hl_id if hl_id else parent_node
+        for link in headline.get_links():
+            edges.append((source, normalize_target(link.value, base_dir)))
+        pending.extend((child, source) for child in reversed(headline.children))
+
+    return DocumentEdges(path, node, alias, edges)
+
+
+def _file_edges(path: str) -> DocumentEdges:
+    with open(path) as f:
+        return document_edges(load(f), path)
+
+
+class LinkGraph:
+    def __init__(self):
+        # Edges are counted, so the same link found on many places (or on
+        # many documents) is only removed with the last of them
+        self._forward: Dict[str, Counter[str]] = collections.defaultdict(collections.Counter)
+        self._backward: Dict[str, Counter[str]] = collections.defaultdict(collections.Counter)
+        self._documents: Dict[str, DocumentEdges] = {}
+        self._aliases: Dict[str, str] = {}  # `file:` node -> `id:` node
+        self._aliased_by: Dict[str, Set[str]] = {}  # `id:` node -> `file:` nodes
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add_edges(self, edges: DocumentEdges):
+        """Add (or replace) the links of a document."""
+        self.remove_document(edges.path)
+        self._documents[edges.path] = edges
+        if edges.alias is not None:
+            self._aliases[edges.alias] = edges.node
+            self._aliased_by.setdefault(edges.node, set()).add(edges.alias)
+        for source, target in edges.edges:
+            self._forward[source][target] += 1
+            self._backward[target][source] += 1
+
+    def add_document(self, doc: OrgDoc, path: Optional[str] = None):
+        self.add_edges(document_edges(doc, path))
+
+    def remove_document(self, path: str):
+        edges = self._documents.pop(os.path.abspath(path), None)
+        if edges is None:
+            return
+        if edges.alias is not None:
+            self._aliases.pop(edges.alias, None)
+            aliases = self._aliased_by.get(edges.node, set())
+            aliases.discard(edges.alias)
+            if not aliases:
+                self._aliased_by.pop(edges.node, None)
+        for source, target in edges.edges:
+            self._remove_edge(self._forward, source, target)
+            self._remove_edge(self._backward, target, source)
+
+    @staticmethod
+    def _remove_edge(index: Dict[str, Counter[str]], key: str, value: str):
+        counter = index[key]
+        counter[value] -= 1
+        if counter[value] <= 0:
+            del counter[value]
+            if not counter:
+                del index[key]
+
+    def resolve(self, node: str) -> str:
+        """The node for `node`, following `file:` links to documents with an ID."""
+        return self._aliases.get(node, node)
+
+    def forward_links(self, node: str) -> Set[str]:
+        """Nodes that `node` links to."""
+        node = self.resolve(node)
+        if node not in self._forward:
+            return set()
+        return {self.resolve(target) for target in self._forward[node]}
+
+    def backlinks(self, node: str) -> Set[str]:
+        """Nodes that link to `node`."""
+        node = self.resolve(node)
+        sources = set(self._backward.get(node, ()))
+        for alias in self._aliased_by.get(node, ()):
+            sources.update(self._backward.get(alias, ()))
+        return sources
+
+    def neighbourhood(self, node: str, hops: int = 1, direction: str = "both") -> Dict[str, int]:
+        """
+        Nodes at most `hops` links away from `node`, with their distance.
+
+        `direction` is "forward", "backward" or "both".
+        """
+        if direction not in ("forward", "backward", "both"):
+            raise ValueError("Unknown direction: {}".format(direction))
+
+        node = self.resolve(node)
+        distances = {node: 0}
+        frontier = [node]
+        for distance in range(1, hops + 1):
+            next_frontier = []
+            for current in frontier:
+                neighbours: Set[str] = set()
+                if direction in ("forward", "both"):
+                    neighbours |= self.forward_links(current)
+                if direction in ("backward", "both"):
+                    neighbours |= self.backlinks(current)
+                for neighbour in neighbours:
+                    if neighbour not in distances:
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        del distances[node]
+        return distances
+
+
+def load_link_graph(paths: Iterable[str], jobs: Optional[int] = None,
+                    graph: Optional[LinkGraph] = None) -> LinkGraph:
+    """
+    Build the link graph of the files (or directories) on `paths`, parsing
+    them on `jobs` worker processes (`jobs=1` parses them here). If `graph` is
+    given, the files are added (or updated) on it.
+    """
+    if graph is None:
+        graph = LinkGraph()
+    files = list(find_files(paths))
+
+    if jobs == 1:
+        results: Iterable[DocumentEdges] = map(_file_edges, files)
+        for edges in results:
+            graph.add_edges(edges)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, min(64, len(files) // ((jobs or os.cpu_count() or 1) * 4)))
+            for edges in executor.map(_file_edges, files, chunksize=chunksize):
+                graph.add_edges(edges)
+    return graph
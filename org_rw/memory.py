@@ -0,0 +1,175 @@
+"""
+Approximate retained memory of parsed documents.
+
+    report = memory_report(doc, source_size=len(text))
+    print(report.total, report.components, report.bytes_per_source_byte)
+
+The report walks every object reachable from the document (counting each one
+only once) and adds up `sys.getsizeof`. Objects shared with the rest of the
+program (classes, functions, compiled regexes, enum members, ...) are not
+accounted for.
+"""
+
+import re
+import sys
+import types
+from enum import Enum
+from typing import Dict, Optional
+
+from .org_rw import (Bold, Code, Headline, Italic, Keyword, Link, LinkToken,
+                     ListItem, MarkerToken, OrgDoc, OrgTime, Property, RawLine,
+                     Strike, TableRow, Text, TimeRange, Timestamp, Underlined,
+                     Verbatim)
+
+COMPONENTS = (
+    "headlines",
+    "tokens",
+    "properties",
+    "timestamps",
+    "matches",
+    "strings",
+    "other",
+)
+
+TYPE_COMPONENTS = {
+    OrgDoc: "other",
+    Headline: "headlines",
+    Text: "tokens",
+    ListItem: "tokens",
+    MarkerToken: "tokens",
+    LinkToken: "tokens",
+    Link: "tokens",
+    Bold: "tokens",
+    Code: "tokens",
+    Italic: "tokens",
+    Strike: "tokens",
+    Underlined: "tokens",
+    Verbatim: "tokens",
+    Property: "properties",
+    Keyword: "properties",
+    OrgTime: "timestamps",
+    Timestamp: "timestamps",
+    TimeRange: "timestamps",
+    re.Match: "matches",
+    str: "strings",
+    RawLine: "other",
+    TableRow: "other",
+}
+
+# Objects that belong to the program, not to the document
+SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    re.Pattern,
+    Enum,
+)
+
+
+class MemoryBudgetExceeded(Exception):
+    """
+    Exception thrown when a document uses more memory than allowed.
+    """
+    pass
+
+
+class MemoryReport:
+    def __init__(self, source_size: Optional[int] = None):
+        self.components: Dict[str, int] = {component: 0 for component in COMPONENTS}
+        self.counts: Dict[str, int] = {component: 0 for component in COMPONENTS}
+        self.source_size = source_size
+
+    @property
+    def total(self) -> int:
+        return sum(self.components.values())
+
+    @property
+    def bytes_per_source_byte(self) -> Optional[float]:
+        if not self.source_size:
+            return None
+        return self.total / self.source_size
+
+    def add(self, component: str, size: int):
+        self.components[component] += size
+        self.counts[component] += 1
+
+    def check_budget(self, max_bytes: Optional[int] = None,
+                     max_bytes_per_source_byte: Optional[float] = None):
+        """Raise `MemoryBudgetExceeded` if the document goes over any of the limits."""
+        if max_bytes is not None and self.total > max_bytes:
+            raise MemoryBudgetExceeded(
+                "Document takes {} bytes, over the budget of {}".format(self.total, max_bytes)
+            )
+        ratio = self.bytes_per_source_byte
+        if max_bytes_per_source_byte is not None:
+            if ratio is None:
+                raise ValueError("Source size needed to check bytes per source byte")
+            if ratio > max_bytes_per_source_byte:
+                raise MemoryBudgetExceeded(
+                    "Document takes {:.2f} bytes per source byte, over the budget of {:.2f}".format(
+                        ratio, max_bytes_per_source_byte
+                    )
+                )
+
+    def as_dict(self) -> Dict:
+        return {
+            "total": self.total,
+            "source_size": self.source_size,
+            "bytes_per_source_byte": self.bytes_per_source_byte,
+            "components": dict(self.components),
+            "counts": dict(self.counts),
+        }
+
+    def __repr__(self):
+        return "<MemoryReport {} bytes: {}>".format(
+            self.total,
+            ", ".join("{}={}".format(k, v) for k, v in self.components.items() if v),
+        )
+
+
+def _children(obj):
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return ()
+    if isinstance(obj, dict):
+        return [item for pair in obj.items() for item in pair]
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return obj
+    if isinstance(obj, re.Match):
+        return (obj.string,)
+
+    children = []
+    if hasattr(obj, "__dict__"):
+        children.append(vars(obj))
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                children.append(getattr(obj, slot))
+    return children
+
+
+def memory_report(doc: OrgDoc, source_size: Optional[int] = None) -> MemoryReport:
+    """
+    Approximate the memory retained by `doc`, broken down by component.
+
+    Containers (lists, dicts, tuples) are accounted for on the component of
+    the object that holds them, strings are always accounted as `strings`.
+    """
+    report = MemoryReport(source_size)
+    seen = set()
+    pending = [(doc, "other")]
+
+    while pending:
+        obj, inherited = pending.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+
+        component = TYPE_COMPONENTS.get(type(obj), inherited)
+        report.add(component, sys.getsizeof(obj))
+
+        for child in _children(obj):
+            pending.append((child, component))
+
+    return report
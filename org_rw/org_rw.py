@@ -2,18 +2,24 @@ from __future__ import annotations
 
 import collections
 from ctypes import ArgumentError
+import bisect
+from fractions import Fraction
 import difflib
+import heapq
 import logging
+import operator
 import os
 import re
 import sys
+import time
 from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import cast, Iterator, List, Literal, Optional, Tuple, Union
+from typing import cast, Dict, Iterable, Iterator, List, Literal, Optional, SupportsIndex, Tuple, Union
 
 from .types import HeadlineDict
 
 from . import dom
+from .stats import LoadStats, activate_load_stats, current_load_stats, measure_phase
 
 DEBUG_DIFF_CONTEXT = 10
 
@@ -52,8 +58,15 @@ BASE_ENVIRONMENT = {
     ),
 }
 
+# Parts of a document that can be selected on `loads`
+LOAD_FIELDS = frozenset(("properties", "planning", "lists", "tables", "links"))
+
 DEFAULT_TODO_KEYWORDS = ["TODO"]
 DEFAULT_DONE_KEYWORDS = ["DONE"]
+TODO_SEQUENCE_KEYS = ("TODO", "SEQ_TODO", "TYP_TODO")
+TODO_SHORTCUT_RE = re.compile(r"\([^)]*\)")
+# TODO state -> whether it's a TODO (not a DONE) state
+TodoStates = Dict[str, bool]
 
 HEADLINE_TAGS_RE = re.compile(r"((:(\w|[0-9_@#%])+)+:)\s*$")
 HEADLINE_RE = re.compile(r"^(?P<stars>\*+)(?P<spacing>\s+)(?P<line>.*?)$")
@@ -100,7 +113,6 @@ IMPLICIT_LINK_RE = re.compile(r'(https?:[^<> ]*[a-zA-Z0-9])')
 BEGIN_BLOCK_RE = re.compile(r"^\s*#\+BEGIN_(?P<subtype>[^ ]+)(?P<arguments>.*)$", re.I)
 END_BLOCK_RE = re.compile(r"^\s*#\+END_(?P<subtype>[^ ]+)\s*$", re.I)
 RESULTS_DRAWER_RE = re.compile(r"^\s*:results:\s*$", re.I)
-CodeSnippet = collections.namedtuple("CodeSnippet", ("name", "content", "result", "arguments"))
 
 # Groupings
 NON_FINISHED_GROUPS = (type(None), dom.ListGroupNode, dom.ResultsDrawerNode, dom.PropertyDrawerNode)
@@ -115,6 +127,14 @@ class NonReproducibleDocument(Exception):
     pass
 
 
+class PartialDocument(Exception):
+    """
+    Exception thrown when dumping a document loaded without some of its
+    elements (see `loads`'s `include`).
+    """
+    pass
+
+
 def get_tokens(value):
     if isinstance(value, Text):
         return value.contents
@@ -125,38 +145,103 @@ def get_tokens(value):
     raise Exception("Unknown how to get tokens from: {}".format(value))
 
 
+class TokenShifts:
+    """
+    How much the tokens of a list have moved because of the edits on its
+    links, by their original position (as a Fenwick tree), so links found
+    on the same list can be located after the others are edited.
+    """
+    def __init__(self, size):
+        self._tree = [0] * (size + 1)
+
+    def add(self, position, delta):
+        """Tokens after the original `position` moved by `delta`."""
+        idx = position + 1
+        while idx < len(self._tree):
+            self._tree[idx] += delta
+            idx += idx & -idx
+
+    def get(self, position):
+        """How much the token on the original `position` moved."""
+        total = 0
+        idx = position
+        while idx > 0:
+            total += self._tree[idx]
+            idx -= idx & -idx
+        return total
+
+
 class RangeInRaw:
-    def __init__(self, content, start_token, end_token):
+    """
+    Tokens between the opening and closing tokens of a link, on a `Text` or
+    a token list, which can be replaced in place.
+    """
+    def __init__(self, content, start_token, end_token, owner=None,
+                 start_index=None, end_index=None, shifts: Optional[TokenShifts] = None):
         self._content = content
-        self._start_id = id(start_token)
-        self._end_id = id(end_token)
+        self._start_token = start_token
+        self._end_token = end_token
+        # Where the range was found, and how the tokens have moved since
+        # then. Used to find the range without scanning the contents.
+        self._start_index = start_index or 0
+        self._length = None
+        if start_index is not None and end_index is not None:
+            self._length = end_index - start_index - 1
+        self._shifts = shifts
+        # Headline to notify of the changes
+        self._owner = owner
+
+    def _find_start(self, contents):
+        hint = self._start_index
+        if self._shifts is not None:
+            hint += self._shifts.get(self._start_index)
+        if 0 <= hint < len(contents) and contents[hint] is self._start_token:
+            return hint
+
+        # The contents were changed in some other way, look around the hint
+        for distance in range(1, max(hint + 1, len(contents) - hint)):
+            for idx in (hint + distance, hint - distance):
+                if 0 <= idx < len(contents) and contents[idx] is self._start_token:
+                    return idx
+        raise Exception("Start token not found")
+
+    def _find_end(self, contents, start_idx):
+        if self._length is not None:
+            idx = start_idx + self._length + 1
+            if idx < len(contents) and contents[idx] is self._end_token:
+                return idx
+
+        for idx in range(start_idx + 1, len(contents)):
+            if contents[idx] is self._end_token:
+                return idx
+        raise Exception("End token not found")
 
     def update_range(self, new_contents):
         contents = self._content
         if isinstance(self._content, Text):
             contents = self._content.contents
 
-        # Find start token
-        for start_idx, tok in enumerate(contents):
-            if id(tok) == self._start_id:
-                break
-        else:
-            raise Exception("Start token not found")
+        start_idx = self._find_start(contents)
+        end_idx = self._find_end(contents, start_idx)
 
-        # Find end token
-        for offset, tok in enumerate(contents[start_idx:]):
-            if id(tok) == self._end_id:
-                break
-        else:
-            raise Exception("End token not found")
+        # Replace the old contents
+        contents[start_idx + 1:end_idx] = new_contents
+        delta = len(new_contents) - (end_idx - start_idx - 1)
+        self._length = len(new_contents)
 
-        # Remove old contents
-        for i in range(1, offset):
-            contents.pop(start_idx + 1)
+        if self._shifts is not None:
+            expected = self._start_index + self._shifts.get(self._start_index)
+            if expected == start_idx:
+                self._shifts.add(self._start_index, delta)
+            else:
+                # Shifts don't match the contents anymore
+                self._shifts = None
+                self._start_index = start_idx
+        else:
+            self._start_index = start_idx
 
-        # Add new ones
-        for i, element in enumerate(new_contents):
-            contents.insert(start_idx + i + 1, element)
+        if self._owner is not None:
+            self._owner._touch()
 
 
 def unescape_block_lines(block: str) -> str:
@@ -179,21 +264,81 @@ def unescape_block_lines(block: str) -> str:
 
     return '\n'.join(lines)
 
-def get_links_from_content(content):
+def parse_header_arguments(arguments: Optional[str]) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Split the arguments of a `#+BEGIN_SRC` line on the language and the
+    header arguments, like `python :tangle out.py` ->
+    `("python", {"tangle": "out.py"})`.
+    """
+    language = None
+    header_arguments: Dict[str, str] = {}
+    key = None
+    for chunk in (arguments or "").split():
+        if chunk.startswith(":"):
+            key = chunk[1:]
+            header_arguments[key] = ""
+        elif key is not None:
+            if header_arguments[key]:
+                header_arguments[key] += " " + chunk
+            else:
+                header_arguments[key] = chunk
+        elif language is None:
+            language = chunk
+
+    return language, header_arguments
+
+
+class CodeSnippet(collections.namedtuple("CodeSnippet", ("name", "content", "result", "arguments"))):
+    __slots__ = ()
+
+    @property
+    def language(self) -> Optional[str]:
+        return parse_header_arguments(self.arguments)[0]
+
+    @property
+    def header_arguments(self) -> Dict[str, str]:
+        return parse_header_arguments(self.arguments)[1]
+
+
+def get_result_from_text(text: Text) -> str:
+    """
+    Contents of a `#+RESULTS` written directly on the text, like `: output`.
+    """
+    result = "\n".join(text.contents)
+
+    if result.strip().startswith(": "):
+        # Split lines and remove ':'
+        lines = result.split("\n")
+        s_result = []
+        for line in lines:
+            if ": " not in line:
+                break
+            s_result.append(line.lstrip(" ")[2:])
+        result = "\n".join(s_result)
+
+    return result
+
+
+def get_links_from_content(content, owner=None):
     in_link = False
     in_description = False
     link_value: List[str] = []
     link_description: List[str] = []
 
-    for i, tok in enumerate(get_tokens(content)):
+    tokens = get_tokens(content)
+    shifts = None
+    for i, tok in enumerate(tokens):
         if isinstance(tok, LinkToken):
             if tok.tok_type == LinkTokenType.OPEN_LINK:
                 in_link = True
                 open_link_token = tok
+                open_link_idx = i
             elif tok.tok_type == LinkTokenType.OPEN_DESCRIPTION:
                 in_description = True
             elif tok.tok_type == LinkTokenType.CLOSE:
-                rng = RangeInRaw(content, open_link_token, tok)
+                if shifts is None:
+                    shifts = TokenShifts(len(tokens))
+                rng = RangeInRaw(content, open_link_token, tok, owner, open_link_idx, i, shifts)
                 yield Link(
                     "".join(link_value),
                     "".join(link_description) if in_description else None,
@@ -208,7 +353,7 @@ def get_links_from_content(content):
                 link_description.append(tok)
             else:
                 link_value.append(tok)
-        elif isinstance(tok, str):
+        elif isinstance(tok, str) and "http" in tok:
             implicit_links = IMPLICIT_LINK_RE.findall(tok)
             for link in implicit_links:
                 yield Link(
@@ -217,7 +362,7 @@ def get_links_from_content(content):
                     None
                 )
 
-def text_to_dom(tokens, item):
+def text_to_dom(tokens, item, owner=None):
     if tokens is None:
         return None
 
@@ -228,15 +373,23 @@ def text_to_dom(tokens, item):
 
     contents = []
 
-    for tok in tokens:
+    # Links on a Text are edited through it, the ones on list items directly
+    # on their token lists
+    holder = item if isinstance(item, Text) else tokens
+    shifts = None
+
+    for i, tok in enumerate(tokens):
         if isinstance(tok, LinkToken):
             if tok.tok_type == LinkTokenType.OPEN_LINK:
                 in_link = True
                 open_link_token = tok
+                open_link_idx = i
             elif tok.tok_type == LinkTokenType.OPEN_DESCRIPTION:
                 in_description = True
             elif tok.tok_type == LinkTokenType.CLOSE:
-                rng = RangeInRaw(item, open_link_token, tok)
+                if shifts is None:
+                    shifts = TokenShifts(len(tokens))
+                rng = RangeInRaw(holder, open_link_token, tok, owner, open_link_idx, i, shifts)
                 contents.append(Link(
                     "".join(link_value),
                     "".join(link_description) if in_description else None,
@@ -256,20 +409,200 @@ def text_to_dom(tokens, item):
 
     return contents
 
+def merge_sorted_elements(*element_lists):
+    """
+    Merge lists of elements by their line number.
+
+    Lists are usually sorted already (they are built in reading order), so
+    they're merged in a single pass. The ones that aren't (like after adding
+    properties) are sorted first.
+    """
+    sorted_lists = []
+    for elements in element_lists:
+        if len(elements) == 0:
+            continue
+        lines = list(map(get_line, elements))
+        if all(lines[i] <= lines[i + 1] for i in range(len(lines) - 1)):
+            sorted_lists.append(elements)
+        else:
+            sorted_lists.append(sorted(elements, key=get_line))
+
+    if len(sorted_lists) == 1:
+        return iter(sorted_lists[0])
+    return heapq.merge(*sorted_lists, key=get_line)
+
+
 def get_line(item):
-    if isinstance(item, Text):
+    if isinstance(item, tuple):
+        # Structural lines and line namedtuples (properties, keywords, ...)
+        return item[0]
+    elif isinstance(item, Text):
         return item.linenum
     elif isinstance(item, ListItem):
         return item.linenum
-    elif isinstance(item, Property):
-        return item.linenum
-    elif isinstance(item, tuple):
-        return item[0]
     else:
         raise Exception("Unknown item type: {}".format(item))
 
 
+def set_line(item, linenum):
+    """
+    Element `item` placed on `linenum`. Tuples can't be changed, so a copy
+    of them is returned, the other elements are updated in place.
+    """
+    if isinstance(item, tuple):
+        if hasattr(item, "_replace"):
+            return item._replace(linenum=linenum)
+        return (linenum,) + item[1:]
+    elif isinstance(item, (Text, ListItem)):
+        item.linenum = linenum
+        return item
+    else:
+        raise Exception("Unknown item type: {}".format(item))
+
+
+def bisect_line(elements, linenum, right=False) -> int:
+    """Like `bisect.bisect_left` (or `_right`) over the lines of `elements`."""
+    low, high = 0, len(elements)
+    while low < high:
+        mid = (low + high) // 2
+        line = get_line(elements[mid])
+        if line < linenum or (right and line == linenum):
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def lines_between(low, high, count: int) -> List:
+    """
+    `count` increasing line numbers between `low` and `high` (either can be
+    `None` for no limit). They are fractions if there's no room for integers.
+
+    Line numbers are only used to sort the elements of a headline, so new
+    elements can be placed anywhere without changing the others.
+    """
+    if high is None:
+        return [low + i for i in range(1, count + 1)]
+    if low is None:
+        return [high - count + i for i in range(count)]
+    if isinstance(low, int) and isinstance(high, int) and high - low > count:
+        return [low + i for i in range(1, count + 1)]
+
+    step = Fraction(high - low) / (count + 1)
+    lines = []
+    for i in range(1, count + 1):
+        line = low + step * i
+        lines.append(int(line) if line.denominator == 1 else line)
+    return lines
+
+
+class _TrackedList(list):
+    """
+    List that notifies its owner (through `_touch()`) of any change on it.
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner, iterable=()):
+        super().__init__(iterable)
+        self._owner = owner
+
+    def append(self, item):
+        super().append(item)
+        self._owner._touch()
+
+    def extend(self, items):
+        super().extend(items)
+        self._owner._touch()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._owner._touch()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._owner._touch()
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._owner._touch()
+
+    def clear(self):
+        super().clear()
+        self._owner._touch()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._owner._touch()
+
+    def reverse(self):
+        super().reverse()
+        self._owner._touch()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._owner._touch()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._owner._touch()
+
+    # `+` and `*` build new (untracked) lists
+    def __add__(self, items: List) -> List:
+        return list(self) + items
+
+    def __mul__(self, times: SupportsIndex) -> List:
+        return list(self) * times
+
+    def __iadd__(self, items: Iterable) -> _TrackedList:
+        result = super().__iadd__(items)
+        self._owner._touch()
+        return result
+
+    def __imul__(self, times: SupportsIndex) -> _TrackedList:
+        result = super().__imul__(times)
+        self._owner._touch()
+        return result
+
+
+class _TrackedAttribute:
+    """
+    Attribute holding a `_TrackedList`. Modifying the list or assigning a
+    new one marks its owner (a headline, document, text or list item) as
+    changed. If `optional`, it can also hold `None`.
+    """
+    def __init__(self, optional=False):
+        self.optional = optional
+
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__[self.name]
+
+    def __set__(self, obj, value):
+        if value is None and self.optional:
+            obj.__dict__[self.name] = None
+        elif isinstance(value, _TrackedList) and value._owner is obj:
+            # Like after `+=`, the list is already there
+            obj.__dict__[self.name] = value
+        else:
+            obj.__dict__[self.name] = _TrackedList(obj, value or ())
+        obj._touch()
+
+
 class Headline:
+    properties = _TrackedAttribute()
+    keywords = _TrackedAttribute()
+    contents = _TrackedAttribute()
+    structural = _TrackedAttribute()
+    delimiters = _TrackedAttribute()
+    list_items = _TrackedAttribute()
+    table_rows = _TrackedAttribute()
+    children = _TrackedAttribute()
+
     def __init__(
         self,
         start_line,
@@ -294,7 +627,17 @@ class Headline:
         is_todo,
         is_done,
         spacing,
+        read_planning=True,
     ):
+        # Changes counter, and values cached until the next change
+        self._version = 0
+        self._dom: Optional[List[dom.DomNode]] = None
+        self._lists: Optional[List[List[ListItem]]] = None
+        self._snippets: Optional[List[CodeSnippet]] = None
+        self._content_index: Optional[Tuple[List[Text], List[int]]] = None
+        self._line_index: Optional[List] = None
+        self.parent = parent
+
         self.start_line = start_line
         self.depth = depth
         self.orig = orig
@@ -315,7 +658,6 @@ class Headline:
         self.delimiters = delimiters
         self.list_items = list_items
         self.table_rows = table_rows
-        self.parent = parent
         self.is_todo = is_todo
         self.is_done = is_done
         self.scheduled = None
@@ -323,6 +665,9 @@ class Headline:
         self.closed = None
         self.spacing = spacing
 
+        if not read_planning:
+            return
+
         # Read planning line
         planning_line = self.get_element_in_line(start_line + 1)
 
@@ -355,6 +700,21 @@ class Headline:
             # Remove from contents
             self._remove_element_in_line(start_line + 1)
 
+    def _touch(self):
+        """
+        Mark the headline contents as changed, dropping the cached values.
+        """
+        self._version += 1
+        self._dom = None
+        self._lists = None
+        self._snippets = None
+        self._content_index = None
+        self._line_index = None
+
+        doc = self.doc
+        if doc is not None:
+            doc._touch()
+
     @property
     def doc(self):
         par = self.parent
@@ -363,62 +723,86 @@ class Headline:
         return par
 
 
-    def as_dom(self):
-        everything = (
-            self.keywords
-            + self.contents
-            + self.list_items
-            + self.table_rows
-            + self.properties
-            + self.structural
-            + self.delimiters
+    def get_elements(self):
+        """
+        All the elements on the headline's body, sorted by line.
+        """
+        return merge_sorted_elements(
+            self.keywords,
+            self.contents,
+            self.list_items,
+            self.table_rows,
+            self.properties,
+            self.structural,
+            self.delimiters,
         )
 
-        tree: List[dom.DomNode] = []
-        current_node: Optional[dom.DomNode] = None
-        indentation_tree: List[dom.ContainerDomNode] = []
-        contents: Optional[str] = None
+    def iter_dom(self) -> Iterator[Tuple[dom.DomEvent, dom.DomNode]]:
+        """
+        Walk the DOM of the headline as a stream of `(event, node)` pairs.
+
+        Containers (lists, tables and drawers) produce an `ENTER` event when
+        they are opened and a `LEAVE` one when they are finished, everything
+        else produces a `LEAF` event. Nodes are yielded with no children, so
+        only the containers currently open are kept alive.
 
-        for line in sorted(everything, key=get_line):
-            if isinstance(current_node, dom.CodeBlock):
+        `as_dom()` is this same walk, folded into a tree.
+        """
+        # Open containers, and the indentation of their last list item
+        stack: List[dom.ContainerDomNode] = []
+        last_indentation: List[Optional[int]] = []
+        code_block: Optional[dom.CodeBlock] = None
+        block_lines: List[str] = []
+
+        def enter(node):
+            stack.append(node)
+            last_indentation.append(None)
+            return (dom.DomEvent.ENTER, node)
+
+        def leave_to(depth):
+            while len(stack) > depth:
+                last_indentation.pop()
+                yield (dom.DomEvent.LEAVE, stack.pop())
+
+        for line in self.get_elements():
+            current_node = stack[-1] if stack else None
+
+            if code_block is not None:
                 if (
                     isinstance(line, DelimiterLine)
                     and line.delimiter_type == DelimiterLineType.END_BLOCK
                 ):
-
-                    start = current_node.header.linenum
-                    end = line.linenum
-
-                    lines = self.get_lines_between(start + 1, end)
-                    contents = unescape_block_lines("\n".join(lines))
+                    contents = unescape_block_lines("\n".join(block_lines))
                     if contents.endswith("\n"):
                         # This is not ideal, but to avoid having to do this maybe
                         # the content parsing must be re-thinked
                         contents = contents[:-1]
 
-                    current_node.set_lines(contents)
-                    tree.append(current_node)
-                    current_node = None
+                    code_block.set_lines(contents)
+                    yield from leave_to(0)
+                    yield (dom.DomEvent.LEAF, code_block)
+                    code_block = None
+                    block_lines = []
+                elif isinstance(line, Text):
+                    block_lines.append(line.get_raw())
                 else:
                     pass # Ignore
 
             elif isinstance(line, Property):
                 if type(current_node) in NON_FINISHED_GROUPS:
-                    current_node = dom.PropertyDrawerNode()
-                    tree.append(current_node)
-                assert isinstance(current_node, dom.PropertyDrawerNode)
-                current_node.append(dom.PropertyNode(line.key, line.value))
+                    yield from leave_to(0)
+                    yield enter(dom.PropertyDrawerNode())
+                assert isinstance(stack[-1], dom.PropertyDrawerNode)
+                yield (dom.DomEvent.LEAF, dom.PropertyNode(line.key, line.value))
 
             elif isinstance(line, Text):
-                tree_up = list(indentation_tree)
-                while len(tree_up) > 0:
-                    node: dom.DomNode = tree_up[-1]
+                for depth in range(len(stack) - 1, -1, -1):
+                    node: dom.DomNode = stack[depth]
                     if (isinstance(node, dom.BlockNode)
                         or isinstance(node, dom.DrawerNode)
                     ):
-                        node.append(dom.Text(line))
-                        current_node = node
-                        contents = None
+                        yield from leave_to(depth + 1)
+                        yield (dom.DomEvent.LEAF, dom.Text(line))
                         break
                     elif ((not isinstance(node, dom.TableNode)) and
                           (type(node) not in NON_FINISHED_GROUPS)
@@ -429,13 +813,9 @@ class Headline:
                             line.linenum,
                             self.doc.path,
                         ))
-                    else:
-                        tree_up.pop(-1)
                 else:
-                    current_node = None
-                    contents = None
-                    tree.append(dom.Text(text_to_dom(line.contents, line)))
-                indentation_tree = tree_up
+                    yield from leave_to(0)
+                    yield (dom.DomEvent.LEAF, dom.Text(text_to_dom(line.contents, line, self)))
 
             elif isinstance(line, ListItem):
                 if (current_node is None
@@ -443,101 +823,56 @@ class Headline:
                     or isinstance(current_node, dom.BlockNode)
                     or isinstance(current_node, dom.DrawerNode)
                 ):
-                    was_node = current_node
-                    current_node = dom.ListGroupNode()
-                    if was_node is None:
-                        tree.append(current_node)
-                    else:
-                        was_node.append(current_node)
-                    indentation_tree.append(current_node)
-                if not isinstance(current_node, dom.ListGroupNode):
-                    if not isinstance(current_node, dom.ListGroupNode):
-                        raise Exception("Expected a {}, found: {} on line {} on {}".format(dom.ListGroupNode, current_node, line.linenum, self.doc.path))
-                        # This can happen. Frequently inside a LogDrawer
+                    yield enter(dom.ListGroupNode())
+                elif not isinstance(current_node, dom.ListGroupNode):
+                    raise Exception("Expected a {}, found: {} on line {} on {}".format(dom.ListGroupNode, current_node, line.linenum, self.doc.path))
 
-                if len(indentation_tree) > 0 and (
-                    (len(indentation_tree[-1].children) > 0)
-                    and len(
-                        [
-                            c
-                            for c in indentation_tree[-1].children
-                            if isinstance(c, dom.ListItem)
-                        ][-1].orig.indentation
-                    )
-                    < len(line.indentation)
+                indentation = len(line.indentation)
+                if (last_indentation[-1] is not None
+                    and last_indentation[-1] < indentation
                 ):
-                    sublist = dom.ListGroupNode()
-                    current_node.append(sublist)
-                    current_node = sublist
-                    indentation_tree.append(current_node)
-
-                while len(indentation_tree) > 0:
-                    list_children = [
-                        c
-                        for c in indentation_tree[-1].children
-                        if isinstance(c, dom.ListItem)
-                    ]
-
-                    if (len(list_children) == 0):
-                        break
-                    if ((len(list_children[-1].orig.indentation)
-                             <= len(line.indentation))):
-                        # No more breaking out of lists, it's indentation
-                        # is less than ours
-                        break
+                    yield enter(dom.ListGroupNode())
 
-                    rem = indentation_tree.pop(-1)
-                    if len(indentation_tree) == 0:
-                        indentation_tree.append(rem)
-                        current_node = rem
-                        break
-                    else:
-                        current_node = indentation_tree[-1]
+                # Break out of the lists more indented than this item, but
+                # always keep the outermost one open
+                while (len(stack) > 1
+                       and last_indentation[-1] is not None
+                       and last_indentation[-1] > indentation
+                ):
+                    yield from leave_to(len(stack) - 1)
 
-                node = dom.ListItem(text_to_dom(line.tag, line), text_to_dom(line.content, line), orig=line)
-                current_node.append(node)
+                if isinstance(stack[-1], dom.ListGroupNode):
+                    last_indentation[-1] = indentation
+                yield (dom.DomEvent.LEAF,
+                       dom.ListItem(text_to_dom(line.tag, line, self), text_to_dom(line.content, line, self), orig=line))
 
             elif isinstance(line, TableRow):
                 if current_node is None:
-                    current_node = dom.TableNode()
-                    tree.append(current_node)
                     # TODO: Allow indentation of this element inside others
-                    indentation_tree = [current_node]
+                    yield enter(dom.TableNode())
                 elif not isinstance(current_node, dom.TableNode):
                     if isinstance(current_node, dom.ListGroupNode):
                         # As an item inside a list
-                        list_node = current_node
-                        current_node = dom.TableNode()
-                        list_node.append(current_node)
-                        indentation_tree.append(current_node)
+                        yield enter(dom.TableNode())
                     else:
                         logging.debug("Expected a {}, found: {} on line {}".format(dom.TableNode, current_node, line.linenum))
                         # This can happen. Frequently inside a LogDrawer
 
                 if len(line.cells) > 0 and len(line.cells[0]) > 0 and line.cells[0][0] == '-':
-                    node = dom.TableSeparatorRow(orig=line)
+                    yield (dom.DomEvent.LEAF, dom.TableSeparatorRow(orig=line))
                 else:
-                    node = dom.TableRow(line.cells, orig=line)
-                current_node = cast(dom.ContainerDomNode, current_node)
-                current_node.append(node)
+                    yield (dom.DomEvent.LEAF, dom.TableRow(line.cells, orig=line))
 
             elif (
                 isinstance(line, DelimiterLine)
                 and line.delimiter_type == DelimiterLineType.BEGIN_BLOCK
             ):
                 assert type(current_node) in NON_FINISHED_GROUPS
-                current_node = dom.CodeBlock(line, line.type_data.subtype, line.arguments)
+                code_block = dom.CodeBlock(line, line.type_data.subtype, line.arguments)
 
             elif isinstance(line, Keyword):
                 logging.warning("Keywords not implemented on `as_dom()`")
 
-            # elif (
-            #     isinstance(line, DelimiterLine)
-            #     and line.delimiter_type == DelimiterLineType.END_BLOCK
-            # ):
-            #     assert isinstance(current_node, dom.BlockNode)
-            #     current_node = None
-
             elif (
                 isinstance(line, tuple)
                 and len(line) == 2
@@ -548,69 +883,89 @@ class Headline:
                 (linenum, content) = line
                 if content.strip().upper() == ":PROPERTIES:":
                     assert current_node is None
-                    current_node = dom.PropertyDrawerNode()
-                    tree.append(current_node)
                     # TODO: Check if this can be nested
-                    indentation_tree = [current_node]
+                    yield enter(dom.PropertyDrawerNode())
                 elif content.strip().upper() == ":LOGBOOK:":
                     assert current_node is None
-                    current_node = dom.LogbookDrawerNode()
-                    tree.append(current_node)
                     # TODO: Check if this can be nested
-                    indentation_tree = [current_node]
+                    yield enter(dom.LogbookDrawerNode())
                 elif content.strip().upper() == ":END:":
-                    if current_node is None and len(indentation_tree) == 0:
+                    if current_node is None:
                         logging.error('Finished node (:END:) with no known starter')
                     else:
-                        tree_up = list(indentation_tree)
-                        while len(tree_up) > 0:
-                            node = tree_up[-1]
-                            if isinstance(node, dom.DrawerNode):
-                                indentation_tree = tree_up
-                                current_node = node
-                                tree_up.pop(-1)
+                        for depth in range(len(stack) - 1, -1, -1):
+                            if isinstance(stack[depth], dom.DrawerNode):
+                                yield from leave_to(depth)
                                 break
-                            else:
-                                tree_up.pop(-1)
                         else:
                             raise Exception('Unexpected node ({}) on headline (id={}), line {}'.format(current_node, self.id, linenum))
-                        current_node = None
                 elif content.strip().upper() == ":RESULTS:":
                     assert current_node is None
-                    current_node = dom.ResultsDrawerNode()
-
                     # TODO: Allow indentation of these blocks inside others
-                    indentation_tree = [current_node]
-                    tree.append(current_node)
+                    yield enter(dom.ResultsDrawerNode())
                 else:
                     raise Exception("Unknown structural line: {}".format(line))
             else:
                 raise Exception("Unknown node type: {}".format(line))
 
-        return tree
+        yield from leave_to(0)
+
+    def as_dom(self):
+        """
+        DOM of the headline's body.
+
+        The tree is cached until the headline changes (through its element
+        lists, `set_property()` or editing its links), so the same tree is
+        returned on repeated calls and should not be modified.
+        """
+        if self._dom is None:
+            self._adopt_elements()
+            self._dom = dom.build_tree(self.iter_dom())
+        return self._dom
+
+    def _adopt_elements(self):
+        """
+        Point the texts and list items to this headline, so editing them in
+        place drops its cached values.
+        """
+        for content in self.contents:
+            content._headline = self
+        for item in self.list_items:
+            item._headline = self
 
     def get_lists(self):
-        lists = []
+        """
+        List items, grouped on the lists they belong to.
+
+        Consecutive items belong to the same list if there are only empty
+        lines between them. The result is cached until the headline changes.
+        """
+        if self._lists is None:
+            self._lists = self._group_list_items()
+        return self._lists
+
+    def _group_list_items(self):
+        lists: List[List[ListItem]] = []
         last_line = None
+        if len(self.list_items) == 0:
+            return lists
+
+        contents, content_lines = self._get_content_index()
 
         for li in self.list_items:
-            if last_line is None:
-                lists.append([li])
-            else:
-                num_lines = li.linenum - (last_line + 1)
-                lines_between = ''.join(['\n' + l
-                                         for l in self.get_lines_between(last_line + 1, li.linenum)]
-                                        )
-
-                # Only empty lines
-                if ((num_lines == lines_between.count('\n'))
-                    and (len(lines_between.strip()) == 0)
+            if last_line is not None:
+                start = bisect.bisect_right(content_lines, last_line)
+                end = bisect.bisect_left(content_lines, li.linenum, lo=start)
+                # Only empty lines between the items
+                if (self._count_between(last_line, li.linenum) == end - start
+                    and all(len(content.get_raw().strip()) == 0 for content in contents[start:end])
                 ):
                     lists[-1].append(li)
-                else:
-                    lists.append([li])
+                    last_line = li.linenum
+                    continue
 
-            last_line = li.linenum + sum(c.count('\n') for c in li.content)
+            lists.append([li])
+            last_line = li.linenum
         return lists
 
     # @DEPRECATED: use `get_lists`
@@ -620,9 +975,12 @@ class Headline:
     def get_tables(self):
         tables: List[List] = []  # TableRow[][]
         last_line = None
+        if len(self.table_rows) == 0:
+            return tables
 
         for row in self.table_rows:
-            if last_line == row.linenum - 1:
+            # Rows with nothing between them
+            if last_line is not None and self._count_between(last_line, row.linenum) == 0:
                 tables[-1].append(row)
             else:
                 tables.append([row])
@@ -709,59 +1067,101 @@ class Headline:
         return default
 
     def set_property(self, name: str, value: str):
-        for prop in self.properties:
+        for i, prop in enumerate(self.properties):
 
             # A matching property is found, update it
             if prop.key == name:
-                prop.value = value
+                self.properties[i] = prop._replace(value=value)
                 return
 
         # No matching property found, add it
         else:
             if len(self.properties) > 0:
                 last_prop = self.properties[-1]
-                last_line = last_prop.linenum
-                last_match = last_prop.match
-            else:
-                self.structural.append(
-                    (
-                        -2,  # Linenum
-                        ":PROPERTIES:",
-                    )
-                )
-                self.structural.append(
-                    (
-                        0,  # Linenum
-                        ":END:",
-                    )
+                prop = Property(
+                    linenum=None,
+                    match=last_prop.match,
+                    key=name,
+                    value=value,
+                    options=None,
                 )
-
-                last_line = -1
-                last_match = None
-            self.properties.append(
-                Property(
-                    linenum=last_line,
-                    match=last_match,
+                self.insert_elements([prop], after=last_prop)
+            else:
+                prop = Property(
+                    linenum=None,
+                    match=None,
                     key=name,
                     value=value,
                     options=None,
                 )
-            )
+                # New drawer at the start of the body
+                first_line = self._line_after(float("-inf"))
+                self._insert_between(
+                    [(None, ":PROPERTIES:"), prop, (None, ":END:")], None, first_line
+                )
 
     def get_links(self):
         for content in self.contents:
-            yield from get_links_from_content(content)
+            if isinstance(content, Text):
+                yield from content.get_links(self)
+            else:
+                yield from get_links_from_content(content, self)
 
         for lst in self.get_lists():
             for item in lst:
-                if item.tag:
-                    yield from  get_links_from_content(item.tag)
-                yield from get_links_from_content(item.content)
+                yield from item.get_links(self)
+
+    def _get_content_index(self) -> Tuple[List[Text], List[int]]:
+        """
+        The contents sorted by line, and their line numbers (for bisecting).
+        """
+        if self._content_index is None:
+            contents = self.contents
+            if any(contents[i].linenum > contents[i + 1].linenum for i in range(len(contents) - 1)):
+                contents = sorted(contents, key=get_line)
+            self._content_index = (contents, [content.linenum for content in contents])
+        return self._content_index
+
+    def _get_content_in_line(self, linenum) -> Optional[Text]:
+        contents, content_lines = self._get_content_index()
+        idx = bisect.bisect_left(content_lines, linenum)
+        if idx < len(content_lines) and content_lines[idx] == linenum:
+            return contents[idx]
+        return None
 
     def get_lines_between(self, start, end):
-        for line in self.contents:
-            if start <= line.linenum < end:
-                yield "".join(line.get_raw())
+        contents, content_lines = self._get_content_index()
+        first = bisect.bisect_left(content_lines, start)
+        last = bisect.bisect_left(content_lines, end, lo=first)
+        for line in contents[first:last]:
+            yield "".join(line.get_raw())
+
+    def _get_lines_after(self, start, end):
+        """Like `get_lines_between`, but without the contents on `start`."""
+        contents, content_lines = self._get_content_index()
+        first = bisect.bisect_right(content_lines, start)
+        last = bisect.bisect_left(content_lines, end, lo=first)
+        for line in contents[first:last]:
+            yield "".join(line.get_raw())
+
+    def _get_line_index(self) -> List:
+        """
+        The lines of all the elements on the body, sorted (for bisecting).
+        """
+        if self._line_index is None:
+            lines = [content.linenum for content in self.contents]
+            lines.extend(item.linenum for item in self.list_items)
+            for elements in (self.keywords, self.table_rows, self.properties,
+                             self.structural, self.delimiters):
+                lines.extend(map(operator.itemgetter(0), elements))
+            lines.sort()
+            self._line_index = lines
+        return self._line_index
+
+    def _count_between(self, low, high) -> int:
+        """Number of elements on the body between the lines `low` and `high`."""
+        lines = self._get_line_index()
+        return bisect.bisect_left(lines, high) - bisect.bisect_right(lines, low)
 
     def get_contents(self, format):
         if format == "raw":
@@ -796,6 +1196,8 @@ class Headline:
         if "\n" not in raw:
             # Remove the element found
             self.contents.pop(found)
+        elif isinstance(el, SourceText) and (rest := el.without_first_line()) is not None:
+            self.contents[found] = rest
         else:
             # Remove the first line
             self.contents[found] = parse_content_block(
@@ -808,90 +1210,112 @@ class Headline:
                 return (s_lnum, struc)
 
     def get_code_snippets(self):
-        inside_code = False
-
-        sections = []
-        arguments = None
-
-        for delimiter in self.delimiters:
-            if delimiter.delimiter_type == DelimiterLineType.BEGIN_BLOCK and delimiter.type_data.subtype.lower() == "src":
-                line_start = delimiter.linenum
-                inside_code = True
-                arguments = delimiter.arguments
-            elif delimiter.delimiter_type == DelimiterLineType.END_BLOCK and delimiter.type_data.subtype.lower() == "src":
-                inside_code = False
-                start, end = line_start, delimiter.linenum
-
-                lines = self.get_lines_between(start + 1, end)
-                contents = unescape_block_lines("\n".join(lines))
-                if contents.endswith("\n"):
-                    # This is not ideal, but to avoid having to do this maybe
-                    # the content parsing must be re-thinked
-                    contents = contents[:-1]
-
-                sections.append(
-                    {
-                        "line_first": start + 1,
-                        "line_last": end - 1,
-                        "content": contents,
-                        "arguments": arguments,
-                    }
-                )
-                arguments = None
-                line_start = None
-
-        for kword in self.keywords:
-            if kword.key.upper() == "RESULTS":
-                for snippet in sections:
-                    if kword.linenum > snippet["line_last"]:
-                        result_first = self.get_element_in_line(kword.linenum + 1)
-
-                        if isinstance(result_first, Text):
-                            result = "\n".join(result_first.contents)
-                            snippet["result"] = result
-
-                            if result.strip().startswith(": "):
-                                # Split lines and remove ':'
-                                lines = result.split("\n")
-                                s_result = []
-                                for line in lines:
-                                    if ": " not in line:
-                                        break
-                                    s_result.append(line.lstrip(" ")[2:])
-                                snippet["result"] = "\n".join(s_result)
-                        elif (
-                            isinstance(result_first, tuple)
-                            and len(result_first) == 2
-                            and result_first[0] == "structural"
-                            and result_first[1].strip().upper() == ":RESULTS:"
-                        ):
-
-                            (end_line, _) = self.get_structural_end_after(
-                                kword.linenum + 1
-                            )
-                            contents = "\n".join(
-                                self.get_lines_between(kword.linenum + 1, end_line)
-                            )
-                            indentation = result_first[1].index(":")
-                            dedented = "\n".join(
-                                [line[indentation:] for line in contents.split("\n")]
-                            )
-                            if dedented.endswith("\n"):
-                                dedented = dedented[:-1]
-
-                            snippet["result"] = dedented
+        """
+        Source blocks of the headline, paired with their `#+RESULTS`.
 
-                        break
+        Extracted in a single pass over the headline's elements, and cached
+        until the headline changes.
+        """
+        if self._snippets is None:
+            self._adopt_elements()
+            self._snippets = self._extract_code_snippets()
+        return list(self._snippets)
+
+    def _extract_code_snippets(self) -> List[CodeSnippet]:
+        if len(self.delimiters) == 0:
+            return []
+
+        sections: List[Dict] = []
+        snippet: Optional[Dict] = None  # Source block being read
+
+        # Snippet waiting for a `:results:` drawer after its `#+RESULTS`
+        # keyword, and the snippet whose drawer is being read
+        results_for: Optional[Dict] = None
+        results_next = None  # Line after the `#+RESULTS`
+        body_lines: Optional[List] = None  # Lines of the whole body, sorted
+        drawer_for: Optional[Dict] = None
+        drawer_line = None
+        drawer_indentation = 0
+
+        results = [kw for kw in self.keywords if kw.key.upper() == "RESULTS"]
+        if len(results) > 0:
+            drawer_lines = [
+                line for line in self.structural
+                if line[1].strip().upper() in (":RESULTS:", ":END:")
+            ]
+        else:
+            drawer_lines = []
 
-        results = []
-        for section in sections:
-            name = None
-            content = section["content"]
-            code_result = section.get("result", None)
-            arguments = section.get("arguments", None)
-            results.append(CodeSnippet(name=name, content=content, result=code_result, arguments=arguments))
+        for element in merge_sorted_elements(self.delimiters, results, drawer_lines):
+            linenum = get_line(element)
+            if results_for is not None and (results_next is None or linenum > results_next):
+                results_for = None
 
-        return results
+            if isinstance(element, DelimiterLine):
+                if element.type_data.subtype.lower() != "src":
+                    continue
+                if element.delimiter_type == DelimiterLineType.BEGIN_BLOCK:
+                    snippet = {
+                        "line_begin": linenum,
+                        "arguments": element.arguments,
+                    }
+                elif snippet is not None:
+                    lines = self._get_lines_after(snippet["line_begin"], linenum)
+                    contents = unescape_block_lines("\n".join(lines))
+                    if contents.endswith("\n"):
+                        # This is not ideal, but to avoid having to do this maybe
+                        # the content parsing must be re-thinked
+                        contents = contents[:-1]
+
+                    snippet["content"] = contents
+                    sections.append(snippet)
+                    snippet = None
+
+            elif isinstance(element, Keyword):
+                if snippet is None and len(sections) > 0:
+                    if body_lines is None:
+                        body_lines = self._get_line_index()
+                    idx = bisect.bisect_right(body_lines, linenum)
+                    results_next = body_lines[idx] if idx < len(body_lines) else None
+                    result_first = None
+                    if results_next is not None:
+                        result_first = self._get_content_in_line(results_next)
+                    if result_first is not None:
+                        sections[-1]["result"] = get_result_from_text(result_first)
+                    else:
+                        results_for = sections[-1]
+
+            elif isinstance(element, tuple) and len(element) == 2:
+                # Structural
+                content = element[1].strip().upper()
+                if (content == ":RESULTS:"
+                    and results_for is not None
+                    and linenum == results_next
+                ):
+                    drawer_for = results_for
+                    drawer_line = linenum
+                    drawer_indentation = element[1].index(":")
+                    results_for = None
+                elif content == ":END:" and drawer_for is not None:
+                    contents = "\n".join(self._get_lines_after(drawer_line, linenum))
+                    dedented = "\n".join(
+                        [line[drawer_indentation:] for line in contents.split("\n")]
+                    )
+                    if dedented.endswith("\n"):
+                        dedented = dedented[:-1]
+
+                    drawer_for["result"] = dedented
+                    drawer_for = None
+
+        return [
+            CodeSnippet(
+                name=None,
+                content=section["content"],
+                result=section.get("result", None),
+                arguments=section.get("arguments", None),
+            )
+            for section in sections
+        ]
 
     def create_headline_at_end(self) -> Headline:
         headline = Headline(
@@ -922,6 +1346,167 @@ class Headline:
         self.children.append(headline)
         return headline
 
+    ## Structural editing
+    def move_to(self, parent: Union[Headline, OrgDoc], index: Optional[int] = None):
+        """
+        Move the headline (with its children) under `parent`, a headline or
+        document, at `index` of its children (at the end by default).
+
+        Only the depths of the moved headlines are updated.
+        """
+        ancestor = parent
+        while isinstance(ancestor, Headline):
+            if ancestor is self:
+                raise ValueError("A headline can't be moved inside itself")
+            ancestor = ancestor.parent
+
+        self.detach()
+        siblings = parent.children if isinstance(parent, Headline) else parent.headlines
+        if index is None:
+            siblings.append(self)
+        else:
+            siblings.insert(index, self)
+        self.parent = parent
+
+        depth = parent.depth + 1 if isinstance(parent, Headline) else 1
+        delta = depth - self.depth
+        if delta != 0:
+            todo = [self]
+            while len(todo) > 0:
+                headline = todo.pop()
+                headline.depth += delta
+                headline._touch()
+                todo.extend(headline.children)
+
+    def detach(self) -> Headline:
+        """Remove the headline (with its children) from its parent."""
+        parent = self.parent
+        if isinstance(parent, Headline):
+            siblings = parent.children
+        elif isinstance(parent, OrgDoc):
+            siblings = parent.headlines
+        else:
+            return self
+
+        for i, sibling in enumerate(siblings):
+            if sibling is self:
+                del siblings[i]
+                break
+        self.parent = None
+        return self
+
+    def _element_list(self, element) -> List:
+        if isinstance(element, Text):
+            return self.contents
+        elif isinstance(element, ListItem):
+            return self.list_items
+        elif isinstance(element, TableRow):
+            return self.table_rows
+        elif isinstance(element, Keyword):
+            return self.keywords
+        elif isinstance(element, Property):
+            return self.properties
+        elif isinstance(element, DelimiterLine):
+            return self.delimiters
+        elif isinstance(element, tuple):
+            return self.structural
+        else:
+            raise Exception("Unknown item type: {}".format(element))
+
+    def _body_lists(self) -> List[List]:
+        return [
+            self.keywords,
+            self.contents,
+            self.list_items,
+            self.table_rows,
+            self.properties,
+            self.structural,
+            self.delimiters,
+        ]
+
+    def _line_after(self, linenum):
+        lines = []
+        for elements in self._body_lists():
+            idx = bisect_line(elements, linenum, right=True)
+            if idx < len(elements):
+                lines.append(get_line(elements[idx]))
+        return min(lines, default=None)
+
+    def _line_before(self, linenum):
+        lines = []
+        for elements in self._body_lists():
+            idx = bisect_line(elements, linenum)
+            if idx > 0:
+                lines.append(get_line(elements[idx - 1]))
+        return max(lines, default=None)
+
+    def _insert_between(self, elements, low, high) -> List:
+        if low is None and high is None:
+            low = self.start_line
+
+        placed = []
+        for element, linenum in zip(elements, lines_between(low, high, len(elements))):
+            element = set_line(element, linenum)
+            target = self._element_list(element)
+            target.insert(bisect_line(target, linenum, right=True), element)
+            placed.append(element)
+        return placed
+
+    def insert_elements(self, elements: List, after=None, before=None) -> List:
+        """
+        Add `elements` (texts, list items, table rows, keywords...) to the
+        body, in order, right after the element `after` or before `before`.
+        If none are given they're added at the end of the body.
+
+        Elements take line numbers between their neighbours, without
+        renumbering the rest. As tuples can't be updated, the elements as
+        they were added are returned.
+        """
+        if after is not None:
+            low = get_line(after)
+            high = self._line_after(low)
+        elif before is not None:
+            high = get_line(before)
+            low = self._line_before(high)
+        else:
+            low = max((get_line(elements[-1]) for elements in self._body_lists() if elements),
+                      default=None)
+            high = None
+        return self._insert_between(elements, low, high)
+
+    def insert_lines(self, text: str, after=None, before=None) -> List:
+        """
+        Parse `text` as body lines and add them like `insert_elements`.
+        """
+        parsed = loads("* _\n" + text, extra_cautious=False).headlines
+        if len(parsed) != 1 or len(parsed[0].children) > 0:
+            raise ValueError("Only body lines can be inserted, use `move_to` for headlines")
+        return self.insert_elements(list(parsed[0].get_elements()), after=after, before=before)
+
+    def remove_element(self, element):
+        """Remove `element` from the body. Returns it, to move it elsewhere."""
+        elements = self._element_list(element)
+        idx = bisect_line(elements, get_line(element))
+        for i in range(idx, len(elements)):
+            if elements[i] is element:
+                del elements[i]
+                return element
+
+        # The list is not sorted
+        for i, other in enumerate(elements):
+            if other is element:
+                del elements[i]
+                return element
+        raise ValueError("Element not found: {}".format(element))
+
+    def move_element(self, element, after=None, before=None):
+        """
+        Move `element` after `after` (or before `before`). Returns the
+        element as it was placed.
+        """
+        self.remove_element(element)
+        return self.insert_elements([element], after=after, before=before)[0]
+
 
 RawLine = collections.namedtuple("RawLine", ("linenum", "line"))
 Keyword = collections.namedtuple(
@@ -932,6 +1517,9 @@ Property = collections.namedtuple(
 )
 
 class ListItem:
+    tag = _TrackedAttribute(optional=True)
+    content = _TrackedAttribute()
+
     def __init__(self,
         linenum, match,
         indentation,
@@ -940,6 +1528,8 @@ class ListItem:
         tag_indentation, tag,
         content,
     ):
+        self._links = None
+        self._headline: Optional[Headline] = None
         self.linenum = linenum
         self.match = match
         self.indentation = indentation
@@ -959,6 +1549,21 @@ class ListItem:
     def append_line(self, line):
         self.content += parse_content_block('\n' + line).contents
 
+    def _touch(self):
+        self._links = None
+        if self._headline is not None:
+            self._headline._touch()
+
+    def get_links(self, owner=None) -> List[Link]:
+        """Links on the tag and contents of the item, kept until they change."""
+        if self._links is None or self._links[0] is not owner:
+            links = []
+            if self.tag:
+                links.extend(get_links_from_content(self.tag, owner))
+            links.extend(get_links_from_content(self.content, owner))
+            self._links = (owner, links)
+        return self._links[1]
+
 TableRow = collections.namedtuple(
     "TableRow",
     (
@@ -1346,10 +1951,25 @@ class Link:
 
 
 class Text:
+    contents = _TrackedAttribute()
+
     def __init__(self, contents, line):
+        self._links = None
+        self._headline: Optional[Headline] = None
         self.contents = contents
         self.linenum = line
 
+    def _touch(self):
+        self._links = None
+        if self._headline is not None:
+            self._headline._touch()
+
+    def get_links(self, owner=None) -> List[Link]:
+        """Links on the text, kept until it changes."""
+        if self._links is None or self._links[0] is not owner:
+            self._links = (owner, list(get_links_from_content(self, owner)))
+        return self._links[1]
+
     def __repr__(self):
         return "{{Text line: {}; content: {} }}".format(self.linenum, self.contents)
 
@@ -1359,6 +1979,49 @@ class Text:
     def get_raw(self):
         return token_list_to_raw(self.contents)
 
+class SourceText(Text):
+    """
+    Text kept as a slice of the document source (loaded with `zero_copy`),
+    which is only tokenized when its contents are read.
+    """
+    def __init__(self, source: str, start: int, end: int, line):
+        self._links = None
+        self._headline: Optional[Headline] = None
+        self._source: Optional[str] = source
+        self._start = start
+        self._end = end
+        self.linenum = line
+
+    @property
+    def contents(self):
+        contents = self.__dict__.get("_contents")
+        if contents is None:
+            # Without contents, the source is still there
+            assert self._source is not None
+            raw = self._source[self._start:self._end]
+            contents = _TrackedList(self, tokens_to_contents(tokenize_contents(raw)))
+            self.__dict__["_contents"] = contents
+            self._source = None
+        return contents
+
+    @contents.setter
+    def contents(self, value):
+        Text.contents.__set__(self, value)
+        self._source = None
+
+    def get_raw(self):
+        if self._source is not None:
+            return self._source[self._start:self._end]
+        return super().get_raw()
+
+    def without_first_line(self) -> Optional[SourceText]:
+        """The same text without its first line, if it's still a slice."""
+        if self._source is None:
+            return None
+        newline = self._source.index("\n", self._start, self._end)
+        return SourceText(self._source, newline + 1, self._end, self.linenum + 1)
+
+
 def token_list_to_plaintext(tok_list) -> str:
     contents = []
     in_link = False
@@ -1645,7 +2308,11 @@ def tokenize_contents(contents: str) -> List[TokenItems]:
     return tokens
 
 
-def parse_contents(raw_contents: List[RawLine]):
+# Document source, and the offset of each of its lines
+SourceLines = Tuple[str, List[int]]
+
+
+def parse_contents(raw_contents: List[RawLine], source: Optional[SourceLines] = None):
     if len(raw_contents) == 0:
         return []
 
@@ -1673,10 +2340,33 @@ def parse_contents(raw_contents: List[RawLine]):
     if len(current_block) > 0:
         blocks.append(current_block)
 
+    if source is not None:
+        text, offsets = source
+        return [
+            SourceText(
+                text,
+                offsets[block[0].linenum - 1],
+                offsets[block[-1].linenum - 1] + len(block[-1].line),
+                block[0].linenum,
+            )
+            for block in blocks
+        ]
     return [parse_content_block(block) for block in blocks]
 
 
 def parse_content_block(raw_contents: Union[List[RawLine],str]):
+    stats = current_load_stats()
+    if stats is None:
+        return _parse_content_block(raw_contents)
+
+    start = time.perf_counter()
+    try:
+        return _parse_content_block(raw_contents)
+    finally:
+        stats.add_time("tokenize", time.perf_counter() - start)
+
+
+def _parse_content_block(raw_contents: Union[List[RawLine],str]):
     contents_buff = []
     if isinstance(raw_contents, str):
         contents_buff.append(raw_contents)
@@ -1691,6 +2381,10 @@ def parse_content_block(raw_contents: Union[List[RawLine],str]):
     else:
         current_line = raw_contents[0].linenum
 
+    return Text(tokens_to_contents(tokens), current_line)
+
+
+def tokens_to_contents(tokens) -> List[Union[str, MarkerToken, LinkToken]]:
     contents: List[Union[str, MarkerToken, LinkToken]] = []
     # Use tokens to tag chunks of text with it's container type
     for (tok_type, tok_val) in tokens:
@@ -1710,7 +2404,7 @@ def parse_content_block(raw_contents: Union[List[RawLine],str]):
         elif tok_type == TOKEN_TYPE_CLOSE_LINK:
             contents.append(LinkToken(LinkTokenType.CLOSE))
 
-    return Text(contents, current_line)
+    return contents
 
 
 def dump_contents(raw):
@@ -1739,39 +2433,69 @@ def dump_contents(raw):
     return (raw.linenum, raw.get_raw())
 
 
-def parse_headline(hl, doc, parent) -> Headline:
-    stars = hl["orig"].group("stars")
-    depth = len(stars)
-    spacing = hl["orig"].group("spacing")
-
+def parse_todo_keywords(keywords: List[Keyword]) -> Tuple[List[str], List[str]]:
+    """
+    TODO and DONE states set by the `#+TODO:`, `#+SEQ_TODO:` and
+    `#+TYP_TODO:` keywords of a document, all of them merged.
+    """
+    todo_keywords: Dict[str, None] = {}
+    done_keywords: Dict[str, None] = {}
+    found = False
+
+    for keyword in keywords:
+        if keyword.key.upper() not in TODO_SEQUENCE_KEYS:
+            continue
+        value = TODO_SHORTCUT_RE.sub("", keyword.value)
+        todo_kws, separator, done_kws = value.partition("|")
+        todo_words = todo_kws.split()
+        done_words = [word for word in done_kws.split() if word != "|"]
+        if not separator:
+            # Without separator, the last state is the DONE one
+            todo_words, done_words = todo_words[:-1], todo_words[-1:]
+
+        found = found or bool(todo_words or done_words)
+        todo_keywords.update(dict.fromkeys(todo_words))
+        done_keywords.update(dict.fromkeys(done_words))
+
+    if not found:
+        return DEFAULT_TODO_KEYWORDS, DEFAULT_DONE_KEYWORDS
+    return list(todo_keywords), [state for state in done_keywords if state not in todo_keywords]
+
+
+def todo_states(todo_keywords: Optional[List[str]], done_keywords: Optional[List[str]]) -> TodoStates:
+    """State matcher for `split_headline_line`. TODO states win over DONE ones."""
+    states = dict.fromkeys(done_keywords or [], False)
+    states.update(dict.fromkeys(todo_keywords or [], True))
+    return states
+
+
+def split_headline_line(line: str, states: TodoStates) -> Tuple[str, Optional[str], List[str]]:
+    """Title, TODO state and tags of the text of a headline line (after the stars)."""
     # TODO: Parse line for priority, cookies and tags
-    line = hl["orig"].group("line")
     hl_tags = HEADLINE_TAGS_RE.search(line)
 
     if hl_tags is None:
         tags = []
     else:
         tags = hl_tags.group(0)[1:-1].split(":")
-        line = HEADLINE_TAGS_RE.sub("", line)
-
-    hl_state = None
-    title = line
-    is_done = is_todo = False
-    for state in doc.todo_keywords or []:
-        if title.startswith(state + " "):
-            hl_state = state
-            title = title[len(state + " ") :]
-            is_todo = True
-            break
-    else:
-        for state in doc.done_keywords or []:
-            if title.startswith(state + " "):
-                hl_state = state
-                title = title[len(state + " ") :]
-                is_done = True
-                break
+        line = line[:hl_tags.start()]
+
+    state, separator, title = line.partition(" ")
+    if separator and state in states:
+        return title, state, tags
+
+    return line, None, tags
+
+
+def parse_headline(hl, doc, parent) -> Headline:
+    depth = hl["depth"]
+    spacing = hl["orig"].group("spacing")
+
+    title, hl_state, tags = split_headline_line(hl["orig"].group("line"), doc._todo_states)
+    is_todo = hl_state is not None and doc._todo_states[hl_state]
+    is_done = hl_state is not None and not is_todo
 
-    contents = parse_contents(hl["contents"])
+    contents = parse_contents(hl["contents"], doc._source_lines)
 
     if not (isinstance(parent, OrgDoc) or depth > parent.depth):
         raise AssertionError("Incorrectly parsed parent on `{}' > `{}'".format(parent.title, title))
@@ -1799,6 +2523,7 @@ def parse_headline(hl, doc, parent) -> Headline:
         is_todo=is_todo,
         is_done=is_done,
         spacing=spacing,
+        read_planning=doc._read_planning,
     )
 
     headline.children = [
@@ -1862,19 +2587,51 @@ def dump_delimiters(line: DelimiterLine):
     return (line.linenum, line.line)
 
 
+class CodeSnippetIndex:
+    """
+    The source blocks of a document, by language and `:tangle` target.
+    """
+    def __init__(self, headlines: Iterable[Headline]):
+        self.snippets: List[CodeSnippet] = []
+        self.by_language: Dict[Optional[str], List[CodeSnippet]] = collections.defaultdict(list)
+        self.by_tangle: Dict[str, List[CodeSnippet]] = collections.defaultdict(list)
+
+        for headline in headlines:
+            for snippet in headline.get_code_snippets():
+                language, header_arguments = parse_header_arguments(snippet.arguments)
+                self.snippets.append(snippet)
+                self.by_language[language].append(snippet)
+
+                tangle = header_arguments.get("tangle")
+                if tangle and tangle != "no":
+                    self.by_tangle[tangle].append(snippet)
+
+    def get_by_language(self, language: Optional[str]) -> List[CodeSnippet]:
+        return self.by_language.get(language, [])
+
+    def get_by_tangle(self, target: str) -> List[CodeSnippet]:
+        return self.by_tangle.get(target, [])
+
+
 class OrgDoc:
+    headlines = _TrackedAttribute()
+
     def __init__(
-        self, headlines, keywords, contents, list_items, structural, properties
+        self, headlines, keywords, contents, list_items, structural, properties,
+        source: Optional[SourceLines] = None,
+        include: Iterable[str] = LOAD_FIELDS,
     ):
-        self.todo_keywords = DEFAULT_TODO_KEYWORDS
-        self.done_keywords = DEFAULT_DONE_KEYWORDS
-
-        for keyword in keywords:
-            if keyword.key in ("TODO", "SEQ_TODO"):
-                todo_kws, done_kws = re.sub(r"\(.\)", "", keyword.value).split("|", 1)
-
-                self.todo_keywords = re.sub(r"\s{2,}", " ", todo_kws.strip()).split()
-                self.done_keywords = re.sub(r"\s{2,}", " ", done_kws.strip()).split()
+        # Changes counter, and values cached until the next change
+        self._version = 0
+        self._snippet_index: Optional[CodeSnippetIndex] = None
+        # Only used while parsing the headlines
+        self._source_lines = source
+        self._read_planning = "planning" in include
+        # Elements not loaded, which can't be written back
+        self.missing_fields = frozenset(("tables",)) - frozenset(include)
+
+        self.todo_keywords, self.done_keywords = parse_todo_keywords(keywords)
+        self._todo_states = todo_states(self.todo_keywords, self.done_keywords)
 
         self.keywords: List[Property] = keywords
         self.contents: List[RawLine] = contents
@@ -1882,9 +2639,17 @@ class OrgDoc:
         self.structural: List = structural
         self.properties: List = properties
         self._path = None
-        self.headlines: List[Headline] = list(
+        self.headlines = list(
             map(lambda hl: parse_headline(hl, self, self), headlines)
         )
+        self._source_lines = None
+
+    def _touch(self):
+        """
+        Mark the document as changed, dropping the cached values.
+        """
+        self._version += 1
+        self._snippet_index = None
 
     @property
     def id(self):
@@ -1936,9 +2701,19 @@ class OrgDoc:
 
             yield hl
 
+    def get_code_snippet_index(self) -> CodeSnippetIndex:
+        """
+        Index of the source blocks on all the document's headlines.
+
+        It's kept until any headline changes, and then rebuilt reusing the
+        snippets of the headlines that didn't change.
+        """
+        if self._snippet_index is None:
+            self._snippet_index = CodeSnippetIndex(self.getAllHeadlines())
+        return self._snippet_index
+
     def get_code_snippets(self):
-        for headline in self.headlines:
-            yield from headline.get_code_snippets()
+        yield from self.get_code_snippet_index().snippets
 
     # Writing
     def dump_headline(self, headline, recursive=True):
@@ -2027,6 +2802,10 @@ class OrgDoc:
                 yield from self.dump_headline(child, recursive=recursive)
 
     def dump(self):
+        if self.missing_fields:
+            raise PartialDocument("Document loaded without its {}".format(
+                ", ".join(sorted(self.missing_fields))))
+
         lines = []
         for prop in self.properties:
             lines.append(dump_property(prop))
@@ -2050,10 +2829,21 @@ class OrgDoc:
 
 
 class OrgDocReader:
-    def __init__(self):
+    def __init__(self, stats: Optional[LoadStats] = None, zero_copy: bool = False,
+                 include: Optional[Iterable[str]] = None, validate: bool = False):
+        self.stats = stats
+        self.zero_copy = zero_copy
+        # Check the headline hierarchy on each headline
+        self.validate = validate
+        self.include = LOAD_FIELDS if include is None else frozenset(include)
+        if unknown := self.include - LOAD_FIELDS:
+            raise ValueError("Unknown fields to load: {}".format(", ".join(sorted(unknown))))
+        # List items are only tokenized if they are going to be read
+        self.tokenize_lists = bool(self.include & {"lists", "links"})
+        self.source_lines: Optional[SourceLines] = None
         self.headlines: List[HeadlineDict] = []
         self.keywords: List[Keyword] = []
-        self.headline_hierarchy: List[Optional[HeadlineDict]] = []
+        self.headline_hierarchy: List[HeadlineDict] = []
         self.contents: List[RawLine] = []
         self.delimiters: List[DelimiterLine] = []
         self.list_items: List[ListItem] = []
@@ -2070,6 +2860,8 @@ class OrgDocReader:
             self.list_items,
             self.structural,
             self.properties,
+            source=self.source_lines,
+            include=self.include,
         )
 
     ## Construction
@@ -2080,6 +2872,7 @@ class OrgDocReader:
 
         headline: HeadlineDict = {
             "linenum": linenum,
+            "depth": depth,
             "orig": match,
             "title": match.group("line"),
             "contents": [],
@@ -2094,40 +2887,35 @@ class OrgDocReader:
             "table_rows": [],
         }
 
-        while (depth - 1) > len(self.headline_hierarchy):
-            # Introduce structural headlines
-            self.headline_hierarchy.append(None)
-        while depth <= len(self.headline_hierarchy):
-            self.headline_hierarchy.pop()
+        # The hierarchy only holds the open headlines, with increasing
+        #  depths (levels can be skipped), so each one is pushed and
+        #  popped once
+        hierarchy = self.headline_hierarchy
+        while hierarchy and hierarchy[-1]["depth"] >= depth:
+            hierarchy.pop()
 
-        if depth == 1:
-            self.headlines.append(headline)
+        if hierarchy:
+            hierarchy[-1]["children"].append(headline)
         else:
-            parent_idx = len(self.headline_hierarchy) - 1
-            while self.headline_hierarchy[parent_idx] is None:
-                parent_idx -= 1
-            parent_headline = self.headline_hierarchy[parent_idx]
-            assert parent_headline is not None
-            parent_headline["children"].append(headline)
-        self.headline_hierarchy.append(headline)
-
-        if all([hl is not None for hl in self.headline_hierarchy]):
-            if not ([ len(cast(HeadlineDict, hl)['orig'].group('stars')) for hl in self.headline_hierarchy ]
-                    == list(range(1, len(self.headline_hierarchy) + 1))):
-                raise AssertionError('Error on Headline Hierarchy')
-        else:
-            # This might happen if headlines with more that 1 level deeper are found
-            pass
+            self.headlines.append(headline)
+        hierarchy.append(headline)
+
+        if self.validate:
+            self.check_hierarchy()
 
-        # We can safely assert this as all the `None`s are there to
-        #  support the addition of a `HeadlineDict` at the correct
-        #  depth but not more
-        assert self.headline_hierarchy[-1] is not None
+    def check_hierarchy(self):
+        """Check the open headlines against their lines, in O(depth)."""
+        depths = [len(hl["orig"].group("stars")) for hl in self.headline_hierarchy]
+        if depths != [hl["depth"] for hl in self.headline_hierarchy]:
+            raise AssertionError("Error on Headline Hierarchy")
+        if any(parent >= child for parent, child in zip(depths, depths[1:])):
+            raise AssertionError("Error on Headline Hierarchy")
 
     def add_list_item_line(self, linenum: int, match: re.Match) -> ListItem:
         li = ListItem(
             linenum=linenum,
-            match=match,
+            # The match keeps the whole line alive
+            match=None if self.zero_copy else match,
             indentation=match.group("indentation"),
             bullet=match.group("bullet"),
             counter=match.group("counter"),
@@ -2135,22 +2923,25 @@ class OrgDocReader:
             checkbox_indentation=match.group("checkbox_indentation"),
             checkbox_value=match.group("checkbox_value"),
             tag_indentation=match.group("tag_indentation"),
-            tag=parse_content_block(
-                [RawLine(linenum=linenum, line=match.group("tag"))]
-            ).contents if match.group("tag") else None,
-            content=parse_content_block(
-                [RawLine(linenum=linenum, line=match.group("content"))]
-            ).contents,
+            tag=self._list_item_text(linenum, match.group("tag")) if match.group("tag") else None,
+            content=self._list_item_text(linenum, match.group("content")),
         )
 
         if len(self.headline_hierarchy) == 0:
             self.list_items.append(li)
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["list_items"].append(li)
         return li
 
+    def _list_item_text(self, linenum: int, text: str) -> List:
+        if not self.tokenize_lists:
+            return [text]
+        return parse_content_block([RawLine(linenum=linenum, line=text)]).contents
+
     def add_table_line(self, linenum: int, line: str):
+        if "tables" not in self.include:
+            return
+
         chunks = line.split('|')
         indentation = len(chunks[0])
         if chunks[-1].strip() == '':
@@ -2173,7 +2964,6 @@ class OrgDocReader:
         if len(self.headline_hierarchy) == 0:
             self.table_rows.append(row)
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["table_rows"].append(row)
 
     def add_keyword_line(self, linenum: int, match: re.Match):
@@ -2188,7 +2978,6 @@ class OrgDocReader:
         if len(self.headline_hierarchy) == 0:
             self.keywords.append(kw)
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["keywords"].append(kw)
 
     def add_raw_line(self, linenum: int, line: str):
@@ -2196,7 +2985,6 @@ class OrgDocReader:
         if len(self.headline_hierarchy) == 0:
             self.contents.append(raw)
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["contents"].append(raw)
 
     def add_begin_block_line(self, linenum: int, match: re.Match):
@@ -2205,7 +2993,6 @@ class OrgDocReader:
         if len(self.headline_hierarchy) == 0:
             self.delimiters.append(line)
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["delimiters"].append(line)
 
     def add_end_block_line(self, linenum: int, match: re.Match):
@@ -2214,7 +3001,6 @@ class OrgDocReader:
         if len(self.headline_hierarchy) == 0:
             self.delimiters.append(line)
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["delimiters"].append(line)
 
     def add_property_drawer_line(self, linenum: int, line: str, match: re.Match):
@@ -2222,17 +3008,14 @@ class OrgDocReader:
             self.current_drawer = self.properties
             self.structural.append((linenum, line))
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.current_drawer = self.headline_hierarchy[-1]["properties"]
             self.headline_hierarchy[-1]["structural"].append((linenum, line))
 
     def add_results_drawer_line(self, linenum: int, line: str, match: re.Match):
-        assert self.headline_hierarchy[-1] is not None
         self.current_drawer = self.headline_hierarchy[-1]["results"]
         self.headline_hierarchy[-1]["structural"].append((linenum, line))
 
     def add_logbook_drawer_line(self, linenum: int, line: str, match: re.Match):
-        assert self.headline_hierarchy[-1] is not None
         self.current_drawer = self.headline_hierarchy[-1]["logbook"]
         self.headline_hierarchy[-1]["structural"].append((linenum, line))
 
@@ -2241,14 +3024,13 @@ class OrgDocReader:
         if len(self.headline_hierarchy) == 0:
             self.structural.append((linenum, line))
         else:
-            assert self.headline_hierarchy[-1] is not None
             self.headline_hierarchy[-1]["structural"].append((linenum, line))
 
     def add_node_properties_line(self, linenum: int, match: re.Match):
         key = match.group("key")
         value = match.group("value").strip()
 
-        if as_time := parse_time(value):
+        if "properties" in self.include and (as_time := parse_time(value)):
             value = as_time
 
         if self.current_drawer is None:  # Throw a better error on this case
@@ -2261,11 +3043,19 @@ class OrgDocReader:
     def read(self, s, environment):
         lines = s.split("\n")
         line_count = len(lines)
+        if self.zero_copy:
+            offsets = []
+            position = 0
+            for line in lines:
+                offsets.append(position)
+                position += len(line) + 1
+            self.source_lines = (s, offsets)
         reader = enumerate(lines)
         in_drawer = False
         in_block = False
         list_item_indentation = None
         list_item = None
+        line_types = self.stats.line_types if self.stats is not None else None
 
         def add_raw_line_with_possible_indentation(linenum, line):
             added = False
@@ -2275,7 +3065,10 @@ class OrgDocReader:
                 if ((line[:list_item.text_start_pos].strip() == '')
                     or (len(line.strip()) == 0)
                 ):
-                    list_item.append_line(line)
+                    if self.tokenize_lists:
+                        list_item.append_line(line)
+                    else:
+                        list_item.content.append('\n' + line)
                     added = True
                 else:
                     list_item = None
@@ -2289,71 +3082,129 @@ class OrgDocReader:
             try:
                 if in_block:
                     if m := END_BLOCK_RE.match(line):
+                        line_type = "end_block"
                         self.add_end_block_line(linenum, m)
                         in_block = False
                         list_item_indentation = None
                         list_item = None
                     else:
+                        line_type = "block_content"
                         add_raw_line_with_possible_indentation(linenum, line)
 
                 elif m := HEADLINE_RE.match(line):
+                    line_type = "headline"
                     list_item_indentation = None
                     list_item = None
                     self.add_headline(linenum, m)
                 elif m := LIST_ITEM_RE.match(line):
+                    line_type = "list_item"
                     list_item = self.add_list_item_line(linenum, m)
                     list_item_indentation = m.group("indentation")
                 elif m := RAW_LINE_RE.match(line):
+                    line_type = "raw"
                     add_raw_line_with_possible_indentation(linenum, line)
                 # Org-babel
                 elif m := BEGIN_BLOCK_RE.match(line):
+                    line_type = "begin_block"
                     self.add_begin_block_line(linenum, m)
                     in_block = True
                     list_item_indentation = None
                     list_item = None
                 elif m := END_BLOCK_RE.match(line):
+                    line_type = "end_block"
                     self.add_end_block_line(linenum, m)
                     in_block = False
                     list_item_indentation = None
                     list_item = None
                 # Generic properties
                 elif m := KEYWORDS_RE.match(line):
+                    line_type = "keyword"
                     self.add_keyword_line(linenum, m)
                 elif m := DRAWER_END_RE.match(line):
+                    line_type = "drawer_end"
                     self.add_drawer_end_line(linenum, line, m)
                     in_drawer = False
                     list_item_indentation = None
                     list_item = None
                 elif (not in_drawer) and (m := DRAWER_START_RE.match(line)):
+                    line_type = "drawer_start"
                     self.add_property_drawer_line(linenum, line, m)
                     in_drawer = True
                     list_item_indentation = None
                     list_item = None
                 elif (not in_drawer) and (m := RESULTS_DRAWER_RE.match(line)):
+                    line_type = "results_drawer"
                     self.add_results_drawer_line(linenum, line, m)
                     in_drawer = True
                     list_item_indentation = None
                     list_item = None
                 elif m := NODE_PROPERTIES_RE.match(line):
+                    line_type = "property"
                     self.add_node_properties_line(linenum, m)
                 elif line.strip().startswith('|'):
+                    line_type = "table"
                     self.add_table_line(linenum, line)
                     list_item_indentation = None
                     list_item = None
                 # Not captured
                 else:
+                    line_type = "other"
                     add_raw_line_with_possible_indentation(linenum, line)
             except:
                 logging.error("Error line {}: {}".format(linenum + 1, line))
                 raise
 
+            if line_types is not None:
+                line_types[line_type] += 1
 
-def loads(s, environment=BASE_ENVIRONMENT, extra_cautious=True):
-    reader = OrgDocReader()
-    reader.read(s, environment)
-    doc = reader.finalize()
-    if extra_cautious:  # Check that all options can be properly re-serialized
-        after_dump = dumps(doc)
+        if self.stats is not None:
+            self.stats.lines += line_count
+
+
+def loads(s, environment=BASE_ENVIRONMENT, extra_cautious=True, stats: Optional[LoadStats] = None,
+          zero_copy: bool = False, include: Optional[Iterable[str]] = None):
+    """
+    Parse the document on `s`.
+
+    With `zero_copy`, the texts of the headlines are kept as slices of `s`
+    and only tokenized when read, and list items don't keep their regex
+    match (`ListItem.match` is `None`). This saves memory on documents that
+    are mostly not read or modified.
+
+    `include` selects which of the `LOAD_FIELDS` are parsed (all of them by
+    default), skipping the work for the rest:
+    - Without "properties", property values are kept as strings, not times.
+    - Without "planning", the planning line is kept on the headline text.
+    - Without "lists" or "links", list items are not tokenized, their tag
+      and content are kept as a single string.
+    - Without "tables", table rows are not loaded. The document can't be
+      dumped (raises `PartialDocument`), and `extra_cautious` is ignored.
+    """
+    if stats is None:
+        stats = current_load_stats()
+    if stats is None:
+        return _loads(s, environment, extra_cautious, None, zero_copy, include)
+
+    start = time.perf_counter()
+    with activate_load_stats(stats):
+        try:
+            return _loads(s, environment, extra_cautious, stats, zero_copy, include)
+        finally:
+            stats.documents += 1
+            stats.bytes += len(s)
+            stats.seconds += time.perf_counter() - start
+
+
+def _loads(s, environment, extra_cautious, stats: Optional[LoadStats], zero_copy: bool = False,
+           include: Optional[Iterable[str]] = None):
+    reader = OrgDocReader(stats=stats, zero_copy=zero_copy, include=include, validate=extra_cautious)
+    with measure_phase(stats, "read"):
+        reader.read(s, environment)
+    with measure_phase(stats, "build"):
+        doc = reader.finalize()
+    if extra_cautious and not doc.missing_fields:  # Check that all options can be properly re-serialized
+        with measure_phase(stats, "verify"):
+            after_dump = dumps(doc)
         if after_dump != s:
             diff = list(
                 difflib.Differ().compare(
@@ -2386,8 +3237,10 @@ def loads(s, environment=BASE_ENVIRONMENT, extra_cautious=True):
     return doc
 
 
-def load(f, environment=BASE_ENVIRONMENT, extra_cautious=False):
-    doc = loads(f.read(), environment, extra_cautious)
+def load(f, environment=BASE_ENVIRONMENT, extra_cautious=False, stats: Optional[LoadStats] = None,
+         zero_copy: bool = False, include: Optional[Iterable[str]] = None):
+    doc = loads(f.read(), environment, extra_cautious, stats=stats, zero_copy=zero_copy,
+                include=include)
     doc._path = os.path.abspath(f.name)
     return doc
 
@@ -0,0 +1,127 @@
+"""
+Read only the outline of a document: the headlines, with their state, tags
+and properties, skipping everything on their bodies.
+
+    for entry in loads_outline(text):
+        print("  " * (entry.depth - 1), entry.state, entry.title, entry.tags, entry.id)
+
+Headlines are found with a single multiline regex over the whole text, and
+only their line and the property drawer that follows them (after the planning
+line, if any) are parsed. Like on `loads`, lines inside blocks are not
+headlines, and the TODO states are the ones set by the `#+TODO:` keywords
+before the first headline.
+
+Property values are kept as (stripped) strings, and drawers anywhere else on
+the body are not read.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, TextIO
+
+from .org_rw import (BEGIN_BLOCK_RE, DRAWER_END_RE, END_BLOCK_RE, KEYWORDS_RE,
+                     NODE_PROPERTIES_RE, PLANNING_RE, Keyword, TodoStates,
+                     parse_todo_keywords, split_headline_line, todo_states)
+
+# Headlines, and the block delimiters that might hide them
+OUTLINE_RE = re.compile(
+    r"^(?:(?P<stars>\*+)[^\S\n]+(?P<line>.*)|[^\S\n]*#\+(?P<block>begin|end)_.*)$",
+    re.MULTILINE | re.IGNORECASE,
+)
+PROPERTIES_START_RE = re.compile(r"^\s*:PROPERTIES:\s*$", re.IGNORECASE)
+
+
+class OutlineEntry(NamedTuple):
+    linenum: int
+    depth: int
+    state: Optional[str]
+    title: str
+    tags: List[str]
+    properties: Dict[str, str]
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.properties.get("ID")
+
+
+def _next_line(s: str, position: int) -> Optional[str]:
+    if position >= len(s):
+        return None
+    end = s.find("\n", position)
+    return s[position:] if end < 0 else s[position:end]
+
+
+def read_properties(s: str, position: int) -> Dict[str, str]:
+    """Properties of the drawer starting on `position`, skipping a planning line."""
+    properties: Dict[str, str] = {}
+    line = _next_line(s, position)
+    if line is not None and PLANNING_RE.match(line):
+        position += len(line) + 1
+        line = _next_line(s, position)
+    if line is None or not PROPERTIES_START_RE.match(line):
+        return properties
+
+    position += len(line) + 1
+    while (line := _next_line(s, position)) is not None:
+        if m := NODE_PROPERTIES_RE.match(line):
+            properties[m.group("key")] = m.group("value").strip()
+        elif DRAWER_END_RE.match(line) or line.strip():
+            break
+        position += len(line) + 1
+    return properties
+
+
+def read_keywords(preamble: str) -> List[Keyword]:
+    """Keywords on the text before the first headline."""
+    keywords = []
+    in_block = False
+    for linenum, line in enumerate(preamble.split("\n"), 1):
+        if in_block:
+            in_block = END_BLOCK_RE.match(line) is None
+        elif BEGIN_BLOCK_RE.match(line):
+            in_block = True
+        elif m := KEYWORDS_RE.match(line):
+            options = m.group("options")
+            keywords.append(Keyword(linenum, m, m.group("key"), m.group("value"),
+                                    options if options is not None else ""))
+    return keywords
+
+
+def loads_outline(s: str) -> List[OutlineEntry]:
+    """Headlines of the document on `s`, in order."""
+    entries = []
+    states: Optional[TodoStates] = None
+    in_block = False
+    linenum = 1
+    position = 0
+
+    for m in OUTLINE_RE.finditer(s):
+        block = m.group("block")
+        if block is not None:
+            if in_block:
+                in_block = END_BLOCK_RE.match(m.group(0)) is None
+            elif BEGIN_BLOCK_RE.match(m.group(0)):
+                in_block = True
+            continue
+        if in_block:
+            continue
+
+        if states is None:
+            states = todo_states(*parse_todo_keywords(read_keywords(s[:m.start()])))
+        linenum += s.count("\n", position, m.start())
+        position = m.start()
+
+        title, state, tags = split_headline_line(m.group("line"), states)
+        entries.append(OutlineEntry(
+            linenum=linenum,
+            depth=len(m.group("stars")),
+            state=state,
+            title=title,
+            tags=tags,
+            properties=read_properties(s, m.end() + 1),
+        ))
+
+    return entries
+
+
+def load_outline(f: TextIO) -> List[OutlineEntry]:
+    return loads_outline(f.read())
@@ -0,0 +1,629 @@
+"""
+Composable predicates to query the headlines of an `OrgDoc`.
+
+Predicates are combined with `&`, `|` and `~`, in the style of org-ql:
+
+    from org_rw.query import todo, tags, scheduled_before, prop
+
+    query = todo("TODO") & tags("work") & scheduled_before(date(2021, 1, 1)) & (prop("EFFORT") > 30)
+    headlines = query.run(doc)
+    print(query.explain(doc))
+
+Before running, the query is compiled into a `QueryPlan`: the predicates that
+can be answered from a `HeadlineIndex` (tags, IDs, TODO states, properties and
+planning dates) are resolved there first, and only the remaining ones are
+evaluated over the resulting candidates. If nothing can be resolved through the
+index, all headlines are scanned.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .org_rw import Headline, OrgDoc, OrgTime, TimeRange
+
+PLANNING_FIELDS = ("scheduled", "deadline", "closed")
+
+
+def to_datetime(value) -> Optional[datetime]:
+    """Convert an org time (or python date) to a comparable `datetime`."""
+    if value is None:
+        return None
+    if isinstance(value, OrgTime):
+        return value.time.to_datetime()
+    if isinstance(value, TimeRange):
+        return value.start
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return None
+
+
+def to_number(value) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+class HeadlineIndex:
+    """
+    Lookup tables over all the headlines of a document.
+
+    Headlines are referred to by their position on `getAllHeadlines()`, so
+    results can be returned in document order.
+    """
+
+    def __init__(self, doc: OrgDoc):
+        self.doc = doc
+        self.headlines: List[Headline] = list(doc.getAllHeadlines())
+        self.by_tag: Dict[str, Set[int]] = {}
+        self.by_id: Dict[str, Set[int]] = {}
+        self.by_state: Dict[Optional[str], Set[int]] = {}
+        self.by_property: Dict[str, Set[int]] = {}
+        self.todo: Set[int] = set()
+        self.done: Set[int] = set()
+        self._dates: Dict[str, Tuple[List[datetime], List[int]]] = {}
+        self._numeric: Dict[str, Tuple[List[float], List[int]]] = {}
+
+        dates: Dict[str, List[Tuple[datetime, int]]] = {
+            field: [] for field in PLANNING_FIELDS
+        }
+        for idx, hl in enumerate(self.headlines):
+            for tag in hl.tags:
+                self.by_tag.setdefault(tag, set()).add(idx)
+            self.by_state.setdefault(hl.state, set()).add(idx)
+            if hl.is_todo:
+                self.todo.add(idx)
+            if hl.is_done:
+                self.done.add(idx)
+            for prop in hl.properties:
+                self.by_property.setdefault(prop.key, set()).add(idx)
+                if prop.key == "ID":
+                    self.by_id.setdefault(prop.value, set()).add(idx)
+            for field in PLANNING_FIELDS:
+                when = to_datetime(getattr(hl, field))
+                if when is not None:
+                    dates[field].append((when, idx))
+
+        for field, values in dates.items():
+            values.sort()
+            self._dates[field] = ([v[0] for v in values], [v[1] for v in values])
+
+    def __len__(self):
+        return len(self.headlines)
+
+    def all(self) -> Set[int]:
+        return set(range(len(self.headlines)))
+
+    def dates(self, field: str) -> Tuple[List[datetime], List[int]]:
+        return self._dates[field]
+
+    def numeric_property(self, name: str) -> Tuple[List[float], List[int]]:
+        """Sorted numeric values of a property, built on first use."""
+        if name not in self._numeric:
+            values = []
+            for idx in self.by_property.get(name, ()):
+                number = to_number(self.headlines[idx].get_property(name))
+                if number is not None:
+                    values.append((number, idx))
+            values.sort()
+            self._numeric[name] = ([v[0] for v in values], [v[1] for v in values])
+        return self._numeric[name]
+
+
+class Predicate:
+    """Base class for the query predicates."""
+
+    def matches(self, headline: Headline) -> bool:
+        raise NotImplementedError()
+
+    def lookup(self, index: HeadlineIndex) -> Optional[Set[int]]:
+        """Positions matching this predicate, or `None` if the index can't answer it."""
+        return None
+
+    def describe(self) -> str:
+        raise NotImplementedError()
+
+    def conjuncts(self) -> List[Predicate]:
+        return [self]
+
+    def __and__(self, other: Predicate) -> Predicate:
+        return And(self.conjuncts() + other.conjuncts())
+
+    def __or__(self, other: Predicate) -> Predicate:
+        return Or([self, other])
+
+    def __invert__(self) -> Predicate:
+        return Not(self)
+
+    def __repr__(self):
+        return "<Query: {}>".format(self.describe())
+
+    ## Execution
+    def compile(self, index: HeadlineIndex) -> QueryPlan:
+        return QueryPlan(self, index)
+
+    def run(self, doc) -> List[Headline]:
+        return self.compile(_as_index(doc)).execute()
+
+    def explain(self, doc) -> str:
+        start = time.perf_counter()
+        index = _as_index(doc)
+        build_time = time.perf_counter() - start
+
+        plan = self.compile(index)
+        plan.execute()
+        explanation = plan.explain()
+        if not isinstance(doc, HeadlineIndex):
+            explanation = "build index over {} headlines ({:.3f}ms)\n{}".format(
+                len(index), build_time * 1000, explanation
+            )
+        return explanation
+
+
+def _as_index(doc) -> HeadlineIndex:
+    if isinstance(doc, HeadlineIndex):
+        return doc
+    return HeadlineIndex(doc)
+
+
+class And(Predicate):
+    def __init__(self, children: List[Predicate]):
+        self.children = children
+
+    def conjuncts(self):
+        return list(self.children)
+
+    def matches(self, headline):
+        return all(child.matches(headline) for child in self.children)
+
+    def lookup(self, index):
+        found = [child.lookup(index) for child in self.children]
+        indexed = sorted((f for f in found if f is not None), key=len)
+        if len(indexed) == 0:
+            return None
+        result = set(indexed[0])
+        for other in indexed[1:]:
+            result &= other
+        if len(indexed) < len(found):
+            # Some children can only be checked one headline at a time
+            return set(
+                idx for idx in result
+                if self.matches(index.headlines[idx])
+            )
+        return result
+
+    def describe(self):
+        return " & ".join(_wrap(child) for child in self.children)
+
+
+class Or(Predicate):
+    def __init__(self, children: List[Predicate]):
+        self.children = children
+
+    def matches(self, headline):
+        return any(child.matches(headline) for child in self.children)
+
+    def lookup(self, index):
+        result: Set[int] = set()
+        for child in self.children:
+            found = child.lookup(index)
+            if found is None:
+                return None
+            result |= found
+        return result
+
+    def describe(self):
+        return " | ".join(_wrap(child) for child in self.children)
+
+
+class Not(Predicate):
+    def __init__(self, child: Predicate):
+        self.child = child
+
+    def matches(self, headline):
+        return not self.child.matches(headline)
+
+    def describe(self):
+        return "~" + _wrap(self.child)
+
+
+def _wrap(predicate: Predicate) -> str:
+    if isinstance(predicate, (And, Or)):
+        return "(" + predicate.describe() + ")"
+    return predicate.describe()
+
+
+class TodoState(Predicate):
+    def __init__(self, states: Tuple[str, ...], done: bool):
+        self.states = states
+        self.done = done
+
+    def matches(self, headline):
+        if self.states:
+            return headline.state in self.states
+        return headline.is_done if self.done else headline.is_todo
+
+    def lookup(self, index):
+        if self.states:
+            result: Set[int] = set()
+            for state in self.states:
+                result |= index.by_state.get(state, set())
+            return result
+        return set(index.done if self.done else index.todo)
+
+    def describe(self):
+        return '{}({})'.format(
+            "done" if self.done else "todo",
+            ", ".join('"{}"'.format(state) for state in self.states),
+        )
+
+
+class Tags(Predicate):
+    def __init__(self, names: Tuple[str, ...]):
+        self.names = names
+
+    def matches(self, headline):
+        tags = headline.tags
+        return all(name in tags for name in self.names)
+
+    def lookup(self, index):
+        sets = sorted((index.by_tag.get(name, set()) for name in self.names), key=len)
+        if len(sets) == 0:
+            return index.all()
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+        return result
+
+    def describe(self):
+        return "tags({})".format(", ".join('"{}"'.format(name) for name in self.names))
+
+
+class HeadlineId(Predicate):
+    def __init__(self, value: str):
+        self.value = value
+
+    def matches(self, headline):
+        return headline.id == self.value
+
+    def lookup(self, index):
+        return set(index.by_id.get(self.value, set()))
+
+    def describe(self):
+        return 'headline_id("{}")'.format(self.value)
+
+
+class PlanningDate(Predicate):
+    def __init__(self, field: str, before: Optional[datetime], after: Optional[datetime]):
+        assert field in PLANNING_FIELDS
+        self.field = field
+        self.before = before
+        self.after = after
+
+    def matches(self, headline):
+        when = to_datetime(getattr(headline, self.field))
+        if when is None:
+            return False
+        if self.before is not None and not (when < self.before):
+            return False
+        if self.after is not None and not (when > self.after):
+            return False
+        return True
+
+    def lookup(self, index):
+        keys, positions = index.dates(self.field)
+        start = 0
+        end = len(keys)
+        if self.after is not None:
+            start = bisect.bisect_right(keys, self.after)
+        if self.before is not None:
+            end = bisect.bisect_left(keys, self.before)
+        return set(positions[start:end])
+
+    def describe(self):
+        if self.before is not None and self.after is not None:
+            return "{}_between({}, {})".format(self.field, self.after, self.before)
+        if self.before is not None:
+            return "{}_before({})".format(self.field, self.before)
+        return "{}_after({})".format(self.field, self.after)
+
+
+class PropertyRef(Predicate):
+    """
+    Property existence check, which can be compared with a value to produce
+    a `PropertyComparison`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def matches(self, headline):
+        return headline.get_property(self.name) is not None
+
+    def lookup(self, index):
+        return set(index.by_property.get(self.name, set()))
+
+    def describe(self):
+        return 'property("{}")'.format(self.name)
+
+    def __eq__(self, value):  # type: ignore
+        return PropertyComparison(self.name, "==", value)
+
+    def __ne__(self, value):  # type: ignore
+        return PropertyComparison(self.name, "!=", value)
+
+    def __lt__(self, value):
+        return PropertyComparison(self.name, "<", value)
+
+    def __le__(self, value):
+        return PropertyComparison(self.name, "<=", value)
+
+    def __gt__(self, value):
+        return PropertyComparison(self.name, ">", value)
+
+    def __ge__(self, value):
+        return PropertyComparison(self.name, ">=", value)
+
+    __hash__ = None  # type: ignore
+
+
+COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+class PropertyComparison(Predicate):
+    def __init__(self, name: str, operator: str, value):
+        self.name = name
+        self.operator = operator
+        self.value = value
+
+    def _coerce(self, prop_value):
+        if isinstance(self.value, (int, float)) and not isinstance(self.value, bool):
+            return to_number(prop_value), float(self.value)
+        if isinstance(self.value, (date, datetime)):
+            return to_datetime(prop_value), to_datetime(self.value)
+        if isinstance(prop_value, (OrgTime, TimeRange)):
+            prop_value = prop_value.to_raw()
+        return prop_value, self.value
+
+    def matches(self, headline):
+        prop_value = headline.get_property(self.name)
+        if prop_value is None:
+            return False
+        left, right = self._coerce(prop_value)
+        if left is None:
+            return False
+        return COMPARATORS[self.operator](left, right)
+
+    def lookup(self, index):
+        if not (isinstance(self.value, (int, float)) and not isinstance(self.value, bool)):
+            # Non-numeric values are checked over the headlines with the property
+            return set(
+                idx for idx in index.by_property.get(self.name, set())
+                if self.matches(index.headlines[idx])
+            )
+
+        keys, positions = index.numeric_property(self.name)
+        value = float(self.value)
+        if self.operator == "==":
+            return set(positions[bisect.bisect_left(keys, value):bisect.bisect_right(keys, value)])
+        if self.operator == "!=":
+            return set(
+                positions[:bisect.bisect_left(keys, value)]
+                + positions[bisect.bisect_right(keys, value):]
+            )
+        if self.operator == "<":
+            return set(positions[:bisect.bisect_left(keys, value)])
+        if self.operator == "<=":
+            return set(positions[:bisect.bisect_right(keys, value)])
+        if self.operator == ">":
+            return set(positions[bisect.bisect_right(keys, value):])
+        assert self.operator == ">="
+        return set(positions[bisect.bisect_left(keys, value):])
+
+    def describe(self):
+        return 'property("{}") {} {!r}'.format(self.name, self.operator, self.value)
+
+
+class TitleContains(Predicate):
+    def __init__(self, text: str):
+        self.text = text
+
+    def matches(self, headline):
+        return self.text in headline.title.get_text()
+
+    def describe(self):
+        return 'title_contains("{}")'.format(self.text)
+
+
+class Where(Predicate):
+    """Arbitrary check over a headline, which can only be evaluated by a scan."""
+
+    def __init__(self, check: Callable[[Headline], bool], name: Optional[str] = None):
+        self.check = check
+        self.name = name or getattr(check, "__name__", "<function>")
+
+    def matches(self, headline):
+        return bool(self.check(headline))
+
+    def describe(self):
+        return "where({})".format(self.name)
+
+
+class PlanStep:
+    def __init__(self, kind: str, description: str, rows_in: int):
+        self.kind = kind
+        self.description = description
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.seconds: Optional[float] = None
+
+    def __repr__(self):
+        return "<PlanStep {} {}>".format(self.kind, self.description)
+
+
+class QueryPlan:
+    """
+    Execution plan for a predicate: a set of index lookups whose results are
+    intersected, followed by a filter with the predicates the index can't
+    answer.
+    """
+
+    def __init__(self, predicate: Predicate, index: HeadlineIndex):
+        self.predicate = predicate
+        self.index = index
+        self.indexed: List[Predicate] = []
+        self.filtered: List[Predicate] = []
+        for conjunct in predicate.conjuncts():
+            if _is_indexable(conjunct):
+                self.indexed.append(conjunct)
+            else:
+                self.filtered.append(conjunct)
+        self.steps: List[PlanStep] = []
+
+    def execute(self) -> List[Headline]:
+        self.steps = []
+        index = self.index
+        candidates: Optional[Set[int]] = None
+
+        lookups = []
+        for predicate in self.indexed:
+            step = PlanStep("index", predicate.describe(), len(index))
+            start = time.perf_counter()
+            found = predicate.lookup(index)
+            assert found is not None
+            step.seconds = time.perf_counter() - start
+            step.rows_out = len(found)
+            lookups.append((found, step))
+
+        # Intersect starting from the most selective lookup
+        lookups.sort(key=lambda lookup: len(lookup[0]))
+        for found, step in lookups:
+            if candidates is None:
+                candidates = set(found)
+            else:
+                step.rows_in = len(candidates)
+                candidates &= found
+                step.rows_out = len(candidates)
+            self.steps.append(step)
+
+        if candidates is None:
+            positions: Iterable[int] = range(len(index))
+            if self.filtered:
+                self.steps.append(PlanStep("scan", "all headlines", len(index)))
+                self.steps[-1].rows_out = len(index)
+                self.steps[-1].seconds = 0.0
+        else:
+            positions = sorted(candidates)
+
+        results = [index.headlines[idx] for idx in positions]
+        for predicate in self.filtered:
+            step = PlanStep("filter", predicate.describe(), len(results))
+            start = time.perf_counter()
+            results = [hl for hl in results if predicate.matches(hl)]
+            step.seconds = time.perf_counter() - start
+            step.rows_out = len(results)
+            self.steps.append(step)
+
+        return results
+
+    def explain(self) -> str:
+        lines = ["query: {}".format(self.predicate.describe())]
+        for step in self.steps:
+            lines.append(
+                "  {kind:<6} {description} [{rows_in} -> {rows_out}] ({ms:.3f}ms)".format(
+                    kind=step.kind,
+                    description=step.description,
+                    rows_in=step.rows_in,
+                    rows_out=step.rows_out,
+                    ms=(step.seconds or 0) * 1000,
+                )
+            )
+        return "\n".join(lines)
+
+
+def _is_indexable(predicate: Predicate) -> bool:
+    if isinstance(predicate, (Not, TitleContains, Where)):
+        return False
+    if isinstance(predicate, And):
+        return any(_is_indexable(child) for child in predicate.children)
+    if isinstance(predicate, Or):
+        return all(_is_indexable(child) for child in predicate.children)
+    return True
+
+
+## Predicate builders
+def todo(*states: str) -> Predicate:
+    """Headlines with any of the given states, or with any TODO state if none is given."""
+    return TodoState(states, done=False)
+
+
+def done(*states: str) -> Predicate:
+    """Headlines with any of the given states, or with any DONE state if none is given."""
+    return TodoState(states, done=True)
+
+
+def tags(*names: str) -> Predicate:
+    """Headlines with all the given tags, including the inherited ones."""
+    return Tags(names)
+
+
+def headline_id(value: str) -> Predicate:
+    return HeadlineId(value)
+
+
+def prop(name: str) -> PropertyRef:
+    return PropertyRef(name)
+
+
+def title_contains(text: str) -> Predicate:
+    return TitleContains(text)
+
+
+def where(check: Callable[[Headline], bool], name: Optional[str] = None) -> Predicate:
+    return Where(check, name)
+
+
+def scheduled_before(when) -> Predicate:
+    return PlanningDate("scheduled", to_datetime(when), None)
+
+
+def scheduled_after(when) -> Predicate:
+    return PlanningDate("scheduled", None, to_datetime(when))
+
+
+def deadline_before(when) -> Predicate:
+    return PlanningDate("deadline", to_datetime(when), None)
+
+
+def deadline_after(when) -> Predicate:
+    return PlanningDate("deadline", None, to_datetime(when))
+
+
+def closed_before(when) -> Predicate:
+    return PlanningDate("closed", to_datetime(when), None)
+
+
+def closed_after(when) -> Predicate:
+    return PlanningDate("closed", None, to_datetime(when))
+
+
+# org-ql style alias. Kept at the end so the module's classes can still use
+# the builtin.
+property = prop
@@ -0,0 +1,191 @@
+"""
+Rewrite link targets across a corpus, like after moving or renaming notes.
+
+    result = rewrite_links(["~/org"], {
+        "file:old-name.org": "file:new-name.org",
+        "id:1234": "id:5678",
+    })
+
+Links are matched on their whole target, or on the part before `::` (so
+`file:old-name.org::*Heading` becomes `file:new-name.org::*Heading`). Only
+the files whose text mentions any of the old targets are parsed, and on them
+only the headlines where they are mentioned are checked. Files are processed
+on a process pool, and only the ones that change are written back.
+"""
+
+import bisect
+import functools
+import os
+import re
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .checker import find_files
+from .org_rw import (Headline, OrgDoc, dumps, get_links_from_content, loads,
+                     parse_content_block)
+
+
+class FileRewrite(NamedTuple):
+    path: str
+    links: int
+    skipped: int
+    error: Optional[str]
+
+
+class RewriteResult(NamedTuple):
+    files_scanned: int
+    files_changed: int
+    links_rewritten: int
+    # Links to rewrite that can't be edited (the ones before the first headline)
+    links_skipped: int
+    errors: List[Tuple[str, str]]
+
+
+def new_target(value: str, mapping: Dict[str, str]) -> Optional[str]:
+    """
+    Target that a link to `value` has to be rewritten to, or `None` if it
+    stays the same.
+    """
+    if value in mapping:
+        return mapping[value]
+    target, separator, search = value.partition("::")
+    if separator and target in mapping:
+        return mapping[target] + separator + search
+    return None
+
+
+def compile_prefilter(mapping: Dict[str, str]) -> re.Pattern:
+    # Longest first, so the regex reports the full targets
+    return re.compile("|".join(map(re.escape, sorted(mapping, key=len, reverse=True))))
+
+
+def matching_lines(text: str, prefilter: re.Pattern) -> List[int]:
+    """Line numbers (1-based, like the parser ones) where `prefilter` matches."""
+    lines: List[int] = []
+    line = 1
+    position = 0
+    for match in prefilter.finditer(text):
+        line += text.count("\n", position, match.start())
+        position = match.start()
+        if not lines or lines[-1] != line:
+            lines.append(line)
+    return lines
+
+
+def _rewrite_content(content, owner, mapping: Dict[str, str]) -> int:
+    count = 0
+    for link in get_links_from_content(content, owner):
+        if link._origin is None:
+            # Implicit links, not editable
+            continue
+        target = new_target(link.value, mapping)
+        if target is not None:
+            link.value = target
+            count += 1
+    return count
+
+
+def rewrite_headline(headline: Headline, mapping: Dict[str, str]) -> int:
+    count = _rewrite_content(headline.title, headline, mapping)
+    for content in headline.contents:
+        count += _rewrite_content(content, headline, mapping)
+    for item in headline.list_items:
+        if item.tag:
+            count += _rewrite_content(item.tag, headline, mapping)
+        count += _rewrite_content(item.content, headline, mapping)
+    return count
+
+
+def rewrite_document(doc: OrgDoc, mapping: Dict[str, str],
+                     lines: Optional[Iterable[int]] = None) -> Tuple[int, int]:
+    """
+    Rewrite the links of `doc` following `mapping`. Returns how many were
+    changed, and how many should have changed but can't be edited (the ones
+    before the first headline, which are kept as raw lines).
+
+    If `lines` is given, only the headlines (or the document preamble)
+    containing those lines are checked.
+    """
+    headlines = list(doc.getAllHeadlines())
+    check_preamble = True
+    if lines is not None:
+        starts = sorted((hl.start_line, i) for i, hl in enumerate(headlines))
+        start_lines = [start for start, _ in starts]
+        selected = set()
+        check_preamble = False
+        for line in lines:
+            idx = bisect.bisect_right(start_lines, line) - 1
+            if idx < 0:
+                check_preamble = True
+            else:
+                selected.add(starts[idx][1])
+        headlines = [headlines[i] for i in sorted(selected)]
+
+    count = 0
+    for headline in headlines:
+        count += rewrite_headline(headline, mapping)
+
+    skipped = 0
+    if check_preamble:
+        for content in doc.contents:
+            for link in get_links_from_content(parse_content_block([content])):
+                if new_target(link.value, mapping) is not None:
+                    skipped += 1
+    return count, skipped
+
+
+def rewrite_file(path: str, mapping: Dict[str, str], prefilter: Optional[re.Pattern] = None,
+                 dry_run: bool = False) -> FileRewrite:
+    try:
+        with open(path) as f:
+            text = f.read()
+
+        if prefilter is None:
+            prefilter = compile_prefilter(mapping)
+        lines = matching_lines(text, prefilter)
+        if not lines:
+            return FileRewrite(path, 0, 0, None)
+
+        # Check the round-trip, this file might be written back
+        doc = loads(text, extra_cautious=True)
+        count, skipped = rewrite_document(doc, mapping, lines)
+        if count > 0 and not dry_run:
+            contents = dumps(doc)
+            with open(path, "w") as f:
+                f.write(contents)
+        return FileRewrite(path, count, skipped, None)
+    except Exception as err:
+        return FileRewrite(path, 0, 0, "".join(traceback.format_exception_only(type(err), err)).strip())
+
+
+def rewrite_links(paths: Iterable[str], mapping: Dict[str, str], *, jobs: Optional[int] = None,
+                  dry_run: bool = False) -> RewriteResult:
+    """
+    Rewrite the links on the files (or directories) on `paths` following
+    `mapping`, from old to new targets.
+
+    Files are processed on `jobs` worker processes (`jobs=1` processes them
+    here). With `dry_run`, changes are counted but nothing is written.
+    """
+    files = list(find_files(paths))
+    if not mapping:
+        return RewriteResult(len(files), 0, 0, 0, [])
+
+    task = functools.partial(rewrite_file, mapping=mapping, prefilter=compile_prefilter(mapping),
+                             dry_run=dry_run)
+    if jobs == 1:
+        results = list(map(task, files))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, min(64, len(files) // ((jobs or os.cpu_count() or 1) * 4)))
+            results = list(executor.map(task, files, chunksize=chunksize))
+
+    changed = [result for result in results if result.links > 0]
+    return RewriteResult(
+        files_scanned=len(results),
+        files_changed=len(changed),
+        links_rewritten=sum(result.links for result in changed),
+        links_skipped=sum(result.skipped for result in results),
+        errors=[(result.path, result.error) for result in results if result.error is not None],
+    )
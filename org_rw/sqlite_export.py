@@ -0,0 +1,348 @@
+"""
+Export a corpus of org files to a normalized SQLite database.
+
+    result = export_corpus(paths, "notes.sqlite3")
+
+Exports are incremental: files whose contents didn't change are skipped, and
+on the ones that did only the rows of the headlines that changed are replaced.
+Headlines are identified by their `ID` property or, if they don't have one, by
+their position on the document (like `#2.1`). The document preamble is stored
+as a headline with the empty key. Headlines that only moved to another line
+just get their `start_line` updated.
+"""
+
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .org_rw import (Headline, OrgDoc, OrgTime, TimeRange, get_links_from_content,
+                     loads)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS headlines (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    key TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    parent_key TEXT,
+    depth INTEGER NOT NULL,
+    start_line INTEGER,
+    title TEXT,
+    state TEXT,
+    is_todo INTEGER NOT NULL,
+    is_done INTEGER NOT NULL,
+    PRIMARY KEY (file_id, key)
+);
+
+CREATE TABLE IF NOT EXISTS properties (
+    file_id INTEGER NOT NULL,
+    headline_key TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    file_id INTEGER NOT NULL,
+    headline_key TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    inherited INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS links (
+    file_id INTEGER NOT NULL,
+    headline_key TEXT NOT NULL,
+    target TEXT NOT NULL,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS timestamps (
+    file_id INTEGER NOT NULL,
+    headline_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT,
+    active INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS clocks (
+    file_id INTEGER NOT NULL,
+    headline_key TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT,
+    minutes INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS properties_headline ON properties (file_id, headline_key);
+CREATE INDEX IF NOT EXISTS properties_key ON properties (key, value);
+CREATE INDEX IF NOT EXISTS tags_headline ON tags (file_id, headline_key);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+CREATE INDEX IF NOT EXISTS links_headline ON links (file_id, headline_key);
+CREATE INDEX IF NOT EXISTS links_target ON links (target);
+CREATE INDEX IF NOT EXISTS timestamps_headline ON timestamps (file_id, headline_key);
+CREATE INDEX IF NOT EXISTS clocks_headline ON clocks (file_id, headline_key);
+"""
+
+# Tables holding rows that belong to a headline
+DETAIL_TABLES = ("properties", "tags", "links", "timestamps", "clocks")
+
+DOC_KEY = ""
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class ExportResult(NamedTuple):
+    files_skipped: int
+    files_updated: int
+    headlines_inserted: int
+    headlines_deleted: int
+    headlines_unchanged: int
+
+
+class HeadlineRows:
+    """All the rows that a single headline contributes to the database."""
+
+    def __init__(self, key: str, parent_key: Optional[str]):
+        self.key = key
+        self.parent_key = parent_key
+        # Not part of the digest, so lines added above don't replace the rows
+        self.start_line: Optional[int] = None
+        self.headline: Tuple = ()
+        self.properties: List[Tuple] = []
+        self.tags: List[Tuple] = []
+        self.links: List[Tuple] = []
+        self.timestamps: List[Tuple] = []
+        self.clocks: List[Tuple] = []
+
+    def digest(self) -> str:
+        data = repr((self.parent_key, self.headline, self.properties, self.tags,
+                     self.links, self.timestamps, self.clocks))
+        return hashlib.sha1(data.encode()).hexdigest()
+
+
+def _format_time(value: datetime) -> str:
+    return value.strftime(TIME_FORMAT)
+
+
+def _time_rows(kind: str, value) -> List[Tuple]:
+    if isinstance(value, TimeRange):
+        return [(kind, _format_time(value.start), _format_time(value.end),
+                 1 if value.start_time.time.active else 0)]
+    if isinstance(value, OrgTime):
+        end = None
+        if value.end_time is not None:
+            end = _format_time(value.end_time.to_datetime())
+        return [(kind, _format_time(value.time.to_datetime()), end, 1 if value.time.active else 0)]
+    return []
+
+
+def _property_value(prop) -> str:
+    if isinstance(prop.value, (OrgTime, TimeRange)):
+        return prop.value.to_raw()
+    return prop.value
+
+
+def _headline_rows(headline: Headline, key: str, parent_key: Optional[str]) -> HeadlineRows:
+    rows = HeadlineRows(key, parent_key)
+    rows.start_line = headline.start_line
+    rows.headline = (
+        headline.depth,
+        headline.title.get_text().strip(),
+        headline.state,
+        1 if headline.is_todo else 0,
+        1 if headline.is_done else 0,
+    )
+    rows.properties = [(prop.key, _property_value(prop)) for prop in headline.properties]
+    rows.tags = [(tag, 0) for tag in headline.shallow_tags]
+    if isinstance(headline.parent, Headline):
+        rows.tags += [(tag, 1) for tag in headline.parent.tags]
+    rows.links = [(link.value, link.description) for link in headline.get_links()]
+    for kind in ("scheduled", "deadline", "closed"):
+        rows.timestamps += _time_rows(kind, getattr(headline, kind))
+    for clock in headline.clock:
+        if isinstance(clock, TimeRange):
+            rows.clocks.append((_format_time(clock.start), _format_time(clock.end),
+                                int(clock.duration.total_seconds() // 60)))
+        else:
+            rows.clocks.append((_format_time(clock.time.to_datetime()), None, None))
+    return rows
+
+
+def _document_rows(doc: OrgDoc) -> List[HeadlineRows]:
+    preamble = HeadlineRows(DOC_KEY, None)
+    preamble.headline = (0, doc.get_keywords("TITLE"), None, 0, 0)
+    preamble.properties = [(prop.key, _property_value(prop)) for prop in doc.properties]
+    preamble.links = [
+        (link.value, link.description)
+        for content in doc.contents
+        for link in get_links_from_content(content)
+    ]
+    result = [preamble]
+
+    seen_ids = set()
+
+    def add(headline: Headline, position: str, parent_key: Optional[str]):
+        hl_id = headline.id
+        if isinstance(hl_id, str) and hl_id not in seen_ids:
+            seen_ids.add(hl_id)
+            key = hl_id
+        else:
+            key = "#" + position
+        result.append(_headline_rows(headline, key, parent_key))
+        for i, child in enumerate(headline.children):
+            add(child, "{}.{}".format(position, i + 1), key)
+
+    for i, headline in enumerate(doc.headlines):
+        add(headline, str(i + 1), DOC_KEY)
+
+    return result
+
+
+def connect(database: Union[str, sqlite3.Connection]) -> sqlite3.Connection:
+    if isinstance(database, sqlite3.Connection):
+        conn = database
+    else:
+        conn = sqlite3.connect(database)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def export_document(conn: sqlite3.Connection, path: str, doc: OrgDoc,
+                    file_hash: str) -> Tuple[int, int, int]:
+    """
+    Upsert the rows of `doc` under `path`. Must be called inside a transaction.
+
+    Returns the number of inserted, deleted and unchanged headlines (the ones
+    that only moved count as unchanged).
+    """
+    row = conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+    existing_lines: Dict[str, Optional[int]] = {}
+    if row is None:
+        file_id = conn.execute("INSERT INTO files (path, hash) VALUES (?, ?)",
+                               (path, file_hash)).lastrowid
+        existing: Dict[str, str] = {}
+    else:
+        file_id = row[0]
+        conn.execute("UPDATE files SET hash = ? WHERE id = ?", (file_hash, file_id))
+        existing = {}
+        for key, digest, start_line in conn.execute(
+                "SELECT key, hash, start_line FROM headlines WHERE file_id = ?", (file_id,)):
+            existing[key] = digest
+            existing_lines[key] = start_line
+
+    new_rows = {}
+    for rows in _document_rows(doc):
+        new_rows[rows.key] = (rows, rows.digest())
+
+    changed = [key for key, digest in existing.items()
+               if key not in new_rows or new_rows[key][1] != digest]
+    added = [(rows, digest) for key, (rows, digest) in new_rows.items()
+             if existing.get(key) != digest]
+    moved = [(rows.start_line, file_id, key) for key, (rows, digest) in new_rows.items()
+             if existing.get(key) == digest and existing_lines[key] != rows.start_line]
+
+    if moved:
+        conn.executemany("UPDATE headlines SET start_line = ? WHERE file_id = ? AND key = ?", moved)
+
+    if changed:
+        keys = [(file_id, key) for key in changed]
+        for table in DETAIL_TABLES:
+            conn.executemany("DELETE FROM {} WHERE file_id = ? AND headline_key = ?".format(table), keys)
+        conn.executemany("DELETE FROM headlines WHERE file_id = ? AND key = ?", keys)
+
+    if added:
+        conn.executemany(
+            "INSERT INTO headlines (file_id, key, hash, parent_key, depth, start_line, title, state, is_todo, is_done)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(file_id, rows.key, digest, rows.parent_key, rows.headline[0], rows.start_line) + rows.headline[1:]
+             for rows, digest in added],
+        )
+        conn.executemany(
+            "INSERT INTO properties (file_id, headline_key, key, value) VALUES (?, ?, ?, ?)",
+            [(file_id, rows.key) + prop for rows, _ in added for prop in rows.properties],
+        )
+        conn.executemany(
+            "INSERT INTO tags (file_id, headline_key, tag, inherited) VALUES (?, ?, ?, ?)",
+            [(file_id, rows.key) + tag for rows, _ in added for tag in rows.tags],
+        )
+        conn.executemany(
+            "INSERT INTO links (file_id, headline_key, target, description) VALUES (?, ?, ?, ?)",
+            [(file_id, rows.key) + link for rows, _ in added for link in rows.links],
+        )
+        conn.executemany(
+            "INSERT INTO timestamps (file_id, headline_key, kind, start, end, active) VALUES (?, ?, ?, ?, ?, ?)",
+            [(file_id, rows.key) + ts for rows, _ in added for ts in rows.timestamps],
+        )
+        conn.executemany(
+            "INSERT INTO clocks (file_id, headline_key, start, end, minutes) VALUES (?, ?, ?, ?, ?)",
+            [(file_id, rows.key) + clock for rows, _ in added for clock in rows.clocks],
+        )
+
+    return len(added), len(changed), len(new_rows) - len(added)
+
+
+def remove_file(conn: sqlite3.Connection, path: str):
+    row = conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+    if row is None:
+        return
+    for table in DETAIL_TABLES + ("headlines",):
+        conn.execute("DELETE FROM {} WHERE file_id = ?".format(table), (row[0],))
+    conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+
+
+def export_corpus(paths: Iterable[str], database: Union[str, sqlite3.Connection],
+                  *, prune: bool = False, batch_files: int = 500) -> ExportResult:
+    """
+    Export (or update) the files on `paths` into `database`.
+
+    Changes are committed every `batch_files` files. If `prune` is set, files
+    on the database which are not on `paths` are removed from it.
+    """
+    conn = connect(database)
+    known = dict(conn.execute("SELECT path, hash FROM files"))
+
+    skipped = updated = inserted = deleted = unchanged = 0
+    exported = set()
+    pending = 0
+    try:
+        conn.execute("BEGIN")
+        for path in paths:
+            path = os.path.abspath(path)
+            exported.add(path)
+            with open(path) as f:
+                contents = f.read()
+            file_hash = hashlib.sha1(contents.encode()).hexdigest()
+            if known.get(path) == file_hash:
+                skipped += 1
+                continue
+
+            doc = loads(contents, extra_cautious=False)
+            counts = export_document(conn, path, doc, file_hash)
+            inserted += counts[0]
+            deleted += counts[1]
+            unchanged += counts[2]
+            updated += 1
+
+            pending += 1
+            if pending >= batch_files:
+                conn.execute("COMMIT")
+                conn.execute("BEGIN")
+                pending = 0
+
+        if prune:
+            for path in set(known) - exported:
+                remove_file(conn, path)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        if not isinstance(database, sqlite3.Connection):
+            conn.close()
+
+    return ExportResult(skipped, updated, inserted, deleted, unchanged)
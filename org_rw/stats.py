@@ -0,0 +1,135 @@
+"""
+Opt-in instrumentation of document loading.
+
+    stats = LoadStats()
+    doc = org_rw.loads(text, stats=stats)
+    print(stats.as_dict())
+
+Or, to collect the stats of every load done inside a block of code:
+
+    with collect_load_stats() as stats:
+        for path in paths:
+            org_rw.load(open(path))
+
+When no stats are being collected the only overhead left on the loading path
+is a context variable lookup per tokenized block.
+"""
+
+import collections
+import contextlib
+import contextvars
+import time
+from typing import Dict, Iterator, Optional
+
+# Phases of `loads()`. Note that `tokenize` happens *inside* `read` (list
+# items) and `build` (text blocks and titles), so its time is also accounted on
+# those.
+PHASES = ("read", "tokenize", "build", "verify")
+
+_ACTIVE_STATS: contextvars.ContextVar[Optional["LoadStats"]] = contextvars.ContextVar(
+    "org_rw_load_stats", default=None
+)
+
+
+class PhaseStats:
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+
+    def __repr__(self):
+        return "<PhaseStats {:.6f}s / {} calls>".format(self.seconds, self.calls)
+
+
+class LoadStats:
+    """Wall time, per-phase call counts and line type histogram of document loads."""
+
+    def __init__(self):
+        self.documents = 0
+        self.bytes = 0
+        self.lines = 0
+        self.seconds = 0.0
+        self.phases: Dict[str, PhaseStats] = {phase: PhaseStats() for phase in PHASES}
+        self.line_types: collections.Counter = collections.Counter()
+
+    def add_time(self, phase: str, seconds: float, calls: int = 1):
+        if phase not in self.phases:
+            self.phases[phase] = PhaseStats()
+        self.phases[phase].seconds += seconds
+        self.phases[phase].calls += calls
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def merge(self, other: "LoadStats"):
+        self.documents += other.documents
+        self.bytes += other.bytes
+        self.lines += other.lines
+        self.seconds += other.seconds
+        for name, phase in other.phases.items():
+            self.add_time(name, phase.seconds, phase.calls)
+        self.line_types.update(other.line_types)
+
+    def as_dict(self) -> Dict:
+        return {
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "seconds": self.seconds,
+            "phases": {
+                name: {"seconds": phase.seconds, "calls": phase.calls}
+                for name, phase in self.phases.items()
+            },
+            "line_types": dict(self.line_types),
+        }
+
+    def to_metrics(self, prefix: str = "org_rw.load") -> Dict[str, float]:
+        """Flat `name -> value` mapping, as expected by most metric pipelines."""
+        metrics: Dict[str, float] = {
+            prefix + ".documents": self.documents,
+            prefix + ".bytes": self.bytes,
+            prefix + ".lines": self.lines,
+            prefix + ".seconds": self.seconds,
+        }
+        for name, phase in self.phases.items():
+            metrics["{}.phase.{}.seconds".format(prefix, name)] = phase.seconds
+            metrics["{}.phase.{}.calls".format(prefix, name)] = phase.calls
+        for line_type, count in self.line_types.items():
+            metrics["{}.lines.{}".format(prefix, line_type)] = count
+        return metrics
+
+    def __repr__(self):
+        return "<LoadStats {} documents, {:.6f}s>".format(self.documents, self.seconds)
+
+
+def current_load_stats() -> Optional[LoadStats]:
+    return _ACTIVE_STATS.get()
+
+
+@contextlib.contextmanager
+def activate_load_stats(stats: Optional[LoadStats]) -> Iterator[Optional[LoadStats]]:
+    """Make `stats` receive the measurements of the nested operations."""
+    token = _ACTIVE_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _ACTIVE_STATS.reset(token)
+
+
+@contextlib.contextmanager
+def collect_load_stats(stats: Optional[LoadStats] = None) -> Iterator[LoadStats]:
+    """Collect the stats of all the documents loaded inside this block."""
+    if stats is None:
+        stats = LoadStats()
+    with activate_load_stats(stats):
+        yield stats
+
+
+def measure_phase(stats: Optional[LoadStats], name: str):
+    if stats is None:
+        return contextlib.nullcontext()
+    return stats.phase(name)
@@ -0,0 +1,147 @@
+"""
+Write the source blocks of documents to the files on their `:tangle`
+header argument.
+
+    result = tangle(["literate/emacs.org", "literate/shell.org"], "~/.config")
+    result = tangle(doc, "build/")
+
+All the blocks going to the same target (across all the documents) are
+written together, in order, with a single write. Targets whose contents
+didn't change are not touched, so their modification time is kept.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .org_rw import OrgDoc, load, parse_header_arguments
+
+# File extensions for `:tangle yes`
+LANGUAGE_EXTENSIONS = {
+    "python": "py",
+    "shell": "sh",
+    "sh": "sh",
+    "bash": "sh",
+    "elisp": "el",
+    "emacs-lisp": "el",
+    "javascript": "js",
+    "js": "js",
+    "ruby": "rb",
+    "rust": "rs",
+}
+
+# (target, content, mkdirp) for every tangled block
+TangledBlock = Tuple[str, str, bool]
+
+
+class TangleResult(NamedTuple):
+    written: List[str]
+    unchanged: List[str]
+
+
+def resolve_target(target: str, language: Optional[str], doc_path: Optional[str],
+                   base_dir: Optional[str]) -> Optional[str]:
+    """
+    Path of the file a block goes to, or `None` if it's not tangled.
+    """
+    if target == "no":
+        return None
+    if target == "yes":
+        if doc_path is None:
+            return None
+        extension = LANGUAGE_EXTENSIONS.get(language or "", language or "txt")
+        target = os.path.splitext(os.path.basename(doc_path))[0] + "." + extension
+
+    target = os.path.expanduser(target)
+    if base_dir is None:
+        base_dir = os.path.dirname(doc_path) if doc_path else os.getcwd()
+    return os.path.abspath(os.path.join(os.path.expanduser(base_dir), target))
+
+
+def collect_blocks(doc: OrgDoc, base_dir: Optional[str] = None) -> List[TangledBlock]:
+    """
+    Tangled blocks of `doc`, in document order. Targets are grouped by the
+    file they resolve to, not by how they are written.
+    """
+    blocks = []
+    for snippet in doc.get_code_snippet_index().snippets:
+        language, header_arguments = parse_header_arguments(snippet.arguments)
+        target = header_arguments.get("tangle")
+        if not target:
+            continue
+        path = resolve_target(target, language, doc.path, base_dir)
+        if path is not None:
+            blocks.append((path, snippet.content, header_arguments.get("mkdirp") == "yes"))
+    return blocks
+
+
+def _collect_file_blocks(args: Tuple[str, Optional[str]]) -> List[TangledBlock]:
+    path, base_dir = args
+    with open(path) as f:
+        doc = load(f)
+    return collect_blocks(doc, base_dir)
+
+
+def write_target(path: str, content: str, mkdirp: bool = False) -> bool:
+    """
+    Write `content` to `path` unless it already has it. Returns if the file
+    was written.
+    """
+    data = content.encode()
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    elif mkdirp:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def tangle(sources: Union[OrgDoc, str, Iterable[Union[OrgDoc, str]]],
+           base_dir: Optional[str] = None, *, jobs: Optional[int] = None) -> TangleResult:
+    """
+    Tangle the source blocks of `sources`: a document, a path or a list of
+    them.
+
+    Relative targets are taken from `base_dir` or, if not set, from the
+    directory of their document. Files on `sources` are loaded on `jobs`
+    worker processes (`jobs=1` loads them here).
+    """
+    if isinstance(sources, (OrgDoc, str)):
+        sources = [sources]
+    sources = list(sources)
+
+    paths = [(source, base_dir) for source in sources if not isinstance(source, OrgDoc)]
+    if jobs == 1 or len(paths) <= 1:
+        file_blocks = list(map(_collect_file_blocks, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            file_blocks = list(executor.map(_collect_file_blocks, paths))
+
+    # Keep the blocks in the order of the sources
+    blocks: List[TangledBlock] = []
+    loaded = iter(file_blocks)
+    for source in sources:
+        if isinstance(source, OrgDoc):
+            blocks.extend(collect_blocks(source, base_dir))
+        else:
+            blocks.extend(next(loaded))
+
+    targets: Dict[str, List[str]] = {}
+    mkdirp: Dict[str, bool] = {}
+    for path, content, block_mkdirp in blocks:
+        targets.setdefault(path, []).append(content)
+        mkdirp[path] = mkdirp.get(path, False) or block_mkdirp
+
+    written = []
+    unchanged = []
+    for path, contents in targets.items():
+        if write_target(path, "\n\n".join(contents) + "\n", mkdirp[path]):
+            written.append(path)
+        else:
+            unchanged.append(path)
+
+    return TangleResult(written, unchanged)
@@ -3,6 +3,7 @@ from typing import List, TypedDict
 
 class HeadlineDict(TypedDict):
     linenum: int
+    depth: int
     orig: re.Match
     title: str
     contents: List
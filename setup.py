@@ -9,6 +9,11 @@ setup(
     license="Apache License 2.0",
     packages=["org_rw"],
     scripts=[],
+    entry_points={
+        "console_scripts": [
+            "org-rw-check=org_rw.checker:main",
+        ],
+    },
     include_package_data=False,
     install_requires=[],
     zip_safe=True,
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from org_rw import dumps, loads
+from org_rw.aio import aload, aload_many, adump, aloads
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestAsyncIO(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_load_and_dump(self):
+        path = os.path.join(DIR, "01-simple.org")
+        with open(path) as f:
+            orig = f.read()
+
+        async def roundtrip():
+            with ThreadPoolExecutor(2) as executor:
+                doc = await aload(path, executor=executor)
+                self.assertEqual(doc.path, path)
+                doc.getTopHeadlines()[0].set_property("UPDATED", "yes")
+                target = os.path.join(self.tmp, "out.org")
+                await adump(doc, target, executor=executor)
+                return doc, target
+
+        doc, target = asyncio.run(roundtrip())
+        with open(target) as f:
+            self.assertEqual(f.read(), dumps(doc))
+        self.assertEqual(loads(orig).getTopHeadlines()[0].id, "01-simple-first-level-id")
+        self.assertEqual(asyncio.run(aloads(orig)).getTopHeadlines()[0].id, "01-simple-first-level-id")
+
+    def test_load_many(self):
+        names = ["01-simple.org", "04-code.org", "05-dates.org", "does-not-exist.org"]
+        paths = [os.path.join(DIR, name) for name in names]
+
+        results = asyncio.run(aload_many(paths, limit=2, return_exceptions=True))
+        self.assertEqual([doc.path for doc in results[:3]], paths[:3])
+        self.assertIsInstance(results[3], FileNotFoundError)
+
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(aload_many(paths, limit=2))
+
+    def test_cancel_many(self):
+        paths = [os.path.join(DIR, "04-code.org")] * 50
+
+        async def cancelled():
+            task = asyncio.ensure_future(aload_many(paths, limit=1))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancelled())
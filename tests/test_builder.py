@@ -0,0 +1,70 @@
+import io
+import unittest
+from datetime import date, datetime
+
+from org_rw import loads
+from org_rw.builder import BuilderError, DocumentBuilder
+
+
+class TestBuilder(unittest.TestCase):
+    def test_build(self):
+        output = io.StringIO()
+        with DocumentBuilder(output, buffer_size=16) as builder:
+            builder.set_property("ID", "doc-id")
+            builder.keyword("TITLE", "Report")
+            builder.headline("First", state="TODO", tags=["a", "b"],
+                             scheduled=datetime(2020, 12, 1, 10, 0))
+            builder.set_property("ID", "first-id")
+            builder.set_planning(deadline=date(2020, 12, 3))
+            builder.text("Some text\n\nacross lines")
+            builder.list_items(["one", "two"])
+            builder.headline("Second", depth=2, properties={"CREATED": "[2020-11-30 Mon]"})
+            builder.table([["Name", "Value"], ["a", 1], ["bb"]], header=True)
+            builder.list_items(["first", "second"], ordered=True)
+
+        text = output.getvalue()
+        self.assertEqual(text, """:PROPERTIES:
+:ID: doc-id
+:END:
+#+TITLE: Report
+* TODO First :a:b:
+  SCHEDULED: <2020-12-01 Tue 10:00> DEADLINE: <2020-12-03 Thu>
+  :PROPERTIES:
+  :ID: first-id
+  :END:
+  Some text
+
+  across lines
+  - one
+  - two
+** Second
+   :PROPERTIES:
+   :CREATED: [2020-11-30 Mon]
+   :END:
+   | Name | Value |
+   |------+-------|
+   | a    | 1     |
+   | bb   |       |
+   1. first
+   2. second
+""")
+
+        # Checks that the document can be re-serialized as it is
+        doc = loads(text)
+        self.assertEqual(doc.id, "doc-id")
+        first = doc.headlines[0]
+        self.assertEqual((first.state, first.shallow_tags, first.id), ("TODO", ["a", "b"], "first-id"))
+        self.assertEqual(first.scheduled.time.to_datetime(), datetime(2020, 12, 1, 10, 0))
+        self.assertEqual(first.deadline.time.to_datetime(), datetime(2020, 12, 3))
+        self.assertEqual([[item.content for item in lst] for lst in first.get_lists()],
+                         [[["one"], ["two"]]])
+        self.assertEqual(len(first.children[0].get_tables()), 1)
+
+    def test_properties_after_body(self):
+        builder = DocumentBuilder(io.StringIO())
+        builder.headline("Headline")
+        builder.text("Body")
+        with self.assertRaises(BuilderError):
+            builder.set_property("ID", "too-late")
+        with self.assertRaises(BuilderError):
+            builder.headline("Two\nlines")
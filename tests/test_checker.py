@@ -0,0 +1,52 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from org_rw.checker import check_file, find_files, main, parse_since
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestChecker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for name in ("01-simple.org", "04-code.org"):
+            shutil.copy(os.path.join(DIR, name), self.tmp)
+        with open(os.path.join(self.tmp, "broken.org"), "w") as f:
+            f.write(":KEY: value before drawer\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_check_file(self):
+        result = check_file(os.path.join(self.tmp, "01-simple.org"))
+        self.assertIsNone(result.error)
+        self.assertGreater(result.size, 0)
+
+        result = check_file(os.path.join(self.tmp, "broken.org"))
+        self.assertIn("Found properties before :PROPERTIES:", result.error)
+
+    def test_continues_past_failures(self):
+        report = os.path.join(self.tmp, "report.json")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            status = main([self.tmp, "--jobs", "1", "--json", report])
+
+        self.assertEqual(status, 1)
+        self.assertIn("[FAIL] 1 of 3 files failed", out.getvalue())
+        with open(report) as f:
+            data = json.load(f)
+        self.assertEqual(data["files"], 3)
+        self.assertEqual(data["failures"], 1)
+
+    def test_since(self):
+        old = time.time() - 3 * 24 * 60 * 60
+        os.utime(os.path.join(self.tmp, "broken.org"), (old, old))
+
+        self.assertEqual(len(list(find_files([self.tmp], parse_since("1d")))), 2)
+        self.assertEqual(len(list(find_files([self.tmp], parse_since("1w")))), 3)
+        self.assertEqual(len(list(find_files([self.tmp], parse_since("2000-01-01")))), 3)
@@ -0,0 +1,46 @@
+import array
+import os
+import unittest
+from datetime import datetime
+
+from org_rw import load
+from org_rw.columnar import NO_PARENT, NO_STATE, NO_TIME, numpy, to_columns
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def minutes(*args):
+    return int((datetime(*args) - datetime(1970, 1, 1)).total_seconds() // 60)
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(DIR, "13-query.org")) as f:
+            self.doc = load(f)
+
+    def test_columns(self):
+        table = to_columns(self.doc, use_numpy=False)
+
+        self.assertEqual(len(table), 5)
+        self.assertIsInstance(table.depth, array.array)
+        self.assertEqual(list(table.depth), [1, 2, 2, 1, 1])
+        self.assertEqual(list(table.parent), [NO_PARENT, 0, 0, NO_PARENT, NO_PARENT])
+        self.assertEqual(table.title, ["Write report", "Collect numbers", "Draft outline",
+                                       "Buy groceries", "Notes"])
+        self.assertEqual([table.states[c] if c != NO_STATE else None for c in table.state],
+                         ["TODO", "TODO", "DONE", "NEXT", None])
+        self.assertEqual(list(table.is_todo), [1, 1, 0, 1, 0])
+        self.assertEqual(list(table.is_done), [0, 0, 1, 0, 0])
+        self.assertEqual(table.scheduled[0], minutes(2021, 1, 10))
+        self.assertEqual(table.deadline[3], minutes(2021, 1, 3))
+        self.assertEqual(table.closed[2], minutes(2021, 1, 5))
+        self.assertEqual(table.closed[0], NO_TIME)
+        self.assertEqual(table.tags(0), ["work"])
+        self.assertEqual(table.tags(1), [])
+        self.assertEqual(table.to_dict()["tags"], [["work"], [], [], ["home"], ["work"]])
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_numpy_columns(self):
+        table = to_columns(self.doc, use_numpy=True)
+        self.assertEqual(table.depth.dtype, numpy.int32)
+        self.assertEqual(int(table.is_todo.sum()), 3)
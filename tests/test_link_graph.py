@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from org_rw import loads
+from org_rw.link_graph import LinkGraph, load_link_graph
+
+ROOT = """:PROPERTIES:
+:ID:       root-id
+:END:
+#+TITLE: Root
+
+* Topic
+  :PROPERTIES:
+  :ID:       topic-id
+  :END:
+  See [[id:other-id][other]] and [[file:plain.org::*Heading][plain]].
+** Without ID
+   Also [[https://example.com][example]].
+"""
+
+OTHER = """* Other
+  :PROPERTIES:
+  :ID:       other-id
+  :END:
+  Back to [[file:root.org][the root]].
+"""
+
+PLAIN = """* Plain
+  Nothing here.
+"""
+
+
+class TestLinkGraph(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for name, contents in (("root.org", ROOT), ("other.org", OTHER), ("plain.org", PLAIN)):
+            self.write(name, contents)
+        self.plain = "file:" + os.path.join(self.tmp, "plain.org")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, contents):
+        with open(os.path.join(self.tmp, name), "w") as f:
+            f.write(contents)
+
+    def test_links(self):
+        graph = load_link_graph([self.tmp], jobs=1)
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(
+            graph.forward_links("id:topic-id"),
+            {"id:other-id", self.plain, "https://example.com"},
+        )
+        # `file:` links to a document with an ID go to its `id:` node
+        self.assertEqual(graph.forward_links("id:other-id"), {"id:root-id"})
+        self.assertEqual(graph.backlinks("id:root-id"), {"id:other-id"})
+        self.assertEqual(graph.backlinks(self.plain), {"id:topic-id"})
+        # Documents with an ID can also be queried through their `file:` node
+        linker = os.path.join(self.tmp, "linker.org")
+        graph.add_document(loads(":PROPERTIES:\n:ID: linker-id\n:END:\nSee [[id:root-id]]\n"), linker)
+        self.assertEqual(graph.backlinks("file:" + os.path.join(self.tmp, "root.org")),
+                         {"id:other-id", "id:linker-id"})
+        self.assertEqual(graph.forward_links("file:" + linker), {"id:root-id"})
+        graph.remove_document(linker)
+
+        self.assertEqual(
+            graph.neighbourhood("id:root-id", hops=2),
+            {"id:other-id": 1, "id:topic-id": 2},
+        )
+        self.assertEqual(graph.neighbourhood("id:topic-id", hops=2, direction="forward"),
+                         {"id:other-id": 1, self.plain: 1, "https://example.com": 1, "id:root-id": 2})
+
+    def test_reload(self):
+        graph = load_link_graph([self.tmp], jobs=1)
+        path = os.path.join(self.tmp, "other.org")
+        self.write("other.org", "* Other\n  :PROPERTIES:\n  :ID:       other-id\n  :END:\n  Nothing.\n")
+        with open(path) as f:
+            graph.add_document(loads(f.read()), path)
+
+        self.assertEqual(graph.forward_links("id:other-id"), set())
+        self.assertEqual(graph.backlinks("id:root-id"), set())
+        self.assertEqual(graph.backlinks("id:other-id"), {"id:topic-id"})
+
+        graph.remove_document(os.path.join(self.tmp, "root.org"))
+        self.assertEqual(graph.backlinks("id:other-id"), set())
+        self.assertEqual(graph.backlinks(self.plain), set())
+
+    def test_shared_edges(self):
+        graph = LinkGraph()
+        doc = loads("* A\n  [[id:x]]\n* B\n  [[id:x]]\n")
+        graph.add_document(doc, os.path.join(self.tmp, "a.org"))
+        graph.add_document(doc, os.path.join(self.tmp, "b.org"))
+        source = "file:" + os.path.join(self.tmp, "a.org")
+
+        graph.remove_document(os.path.join(self.tmp, "b.org"))
+        self.assertEqual(graph.backlinks("id:x"), {source})
+
+    def test_in_memory_documents(self):
+        graph = LinkGraph()
+        with self.assertRaises(ValueError):
+            graph.add_document(loads("* A\n  [[id:x][y]]\n"))
+
+        first = os.path.join(self.tmp, "notes", "first.org")
+        graph.add_document(loads("* A\n  [[file:second.org][second]]\n"), first)
+        graph.add_document(loads(":PROPERTIES:\n:ID: second-id\n:END:\n* B\n  [[id:x][y]]\n"),
+                           os.path.join(self.tmp, "notes", "second.org"))
+
+        self.assertEqual(graph.forward_links("file:" + first), {"id:second-id"})
+        self.assertEqual(graph.backlinks("id:second-id"), {"file:" + first})
+        self.assertEqual(graph.backlinks("id:x"), {"id:second-id"})
@@ -0,0 +1,37 @@
+import os
+import unittest
+
+import org_rw
+from org_rw.memory import COMPONENTS, MemoryBudgetExceeded, memory_report
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestMemoryReport(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(DIR, "05-dates.org")) as f:
+            self.orig = f.read()
+        self.doc = org_rw.loads(self.orig)
+
+    def test_components(self):
+        report = memory_report(self.doc, source_size=len(self.orig))
+
+        self.assertEqual(set(report.components), set(COMPONENTS))
+        self.assertEqual(report.total, sum(report.components.values()))
+        self.assertGreater(report.counts["headlines"], 0)
+        for component in ("headlines", "tokens", "properties", "timestamps", "matches", "strings"):
+            self.assertGreater(report.components[component], 0, component)
+        self.assertAlmostEqual(report.bytes_per_source_byte, report.total / len(self.orig))
+
+    def test_tracks_live_changes(self):
+        before = memory_report(self.doc).total
+        self.doc.getTopHeadlines()[0].set_property("NOTES", "x" * 10000)
+        self.assertGreater(memory_report(self.doc).total, before + 10000)
+
+    def test_budget(self):
+        report = memory_report(self.doc, source_size=len(self.orig))
+        report.check_budget(max_bytes=report.total, max_bytes_per_source_byte=100)
+        with self.assertRaises(MemoryBudgetExceeded):
+            report.check_budget(max_bytes=report.total - 1)
+        with self.assertRaises(MemoryBudgetExceeded):
+            report.check_budget(max_bytes_per_source_byte=1)
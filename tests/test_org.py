@@ -452,6 +452,249 @@ class TestSerde(unittest.TestCase):
 
         ex.assert_matches(self, doc)
 
+    def test_dom_cache_file_03(self):
+        with open(os.path.join(DIR, "03-links.org")) as f:
+            doc = load(f)
+
+        hl = doc.getTopHeadlines()[0]
+        tree = hl.as_dom()
+        self.assertIs(hl.as_dom(), tree)
+
+        # Editing a link drops the cached tree
+        link = next(hl.get_links())
+        link.value = "https://codigoparallevar.com/1-updated"
+        tree = hl.as_dom()
+        self.assertIsNot(tree, None)
+        texts = [node for node in tree if isinstance(node, dom.Text)]
+        self.assertEqual(texts[0].content[1].value, "https://codigoparallevar.com/1-updated")
+
+        # So does updating a property
+        hl.set_property("CREATED", "[2021-01-01 Fri 01:01]")
+        self.assertIsNot(hl.as_dom(), tree)
+        self.assertEqual(hl.get_property("CREATED"), "[2021-01-01 Fri 01:01]")
+        self.assertIn(":CREATED:  [2021-01-01 Fri 01:01]", dumps(doc))
+
+        # And changing the element lists
+        tree = hl.as_dom()
+        hl.contents.pop()
+        self.assertIsNot(hl.as_dom(), tree)
+        tree = hl.as_dom()
+        hl.contents = []
+        self.assertIsNot(hl.as_dom(), tree)
+
+    def test_dom_cache_in_place_edits(self):
+        doc = loads("* Headline\n  Some text\n  - Item\n\n  #+BEGIN_SRC python\n  print(1)\n  #+END_SRC")
+        hl = doc.headlines[0]
+
+        tree = hl.as_dom()
+        hl.contents[0].contents.append(" EXTRA")
+        self.assertIsNot(hl.as_dom(), tree)
+        texts = [node for node in hl.as_dom() if isinstance(node, dom.Text)]
+        self.assertIn(" EXTRA", texts[0].content)
+
+        tree = hl.as_dom()
+        hl.list_items[0].content.append(" CHANGED")
+        self.assertIsNot(hl.as_dom(), tree)
+        items = [node for node in hl.as_dom() if isinstance(node, dom.ListGroupNode)][0]
+        self.assertEqual(items.children[0].content[-1], " CHANGED")
+
+        self.assertEqual(hl.get_code_snippets()[0].content, "  print(1)")
+        code = [content for content in hl.contents if "print(1)" in content.get_raw()][0]
+        code.contents = ["  print(2)"]
+        self.assertEqual(hl.get_code_snippets()[0].content, "  print(2)")
+        self.assertEqual(doc.get_code_snippet_index().snippets[0].content, "  print(2)")
+
+    def test_update_links_same_paragraph(self):
+        doc = loads("* Links\n  [[a][A]] [[b]] [[c][C]] [[d]]\n  - Item with [[e][E]]\n")
+        links = list(doc.get_links())
+        self.assertEqual([link.value for link in links], ["a", "b", "c", "d", "e"])
+
+        # Out of order, changing the number of tokens of each link
+        links[2].description = None
+        links[0].description = None
+        links[1].description = "B"
+        links[3].value = "d-updated"
+        links[2].value = "c-updated"
+
+        # Links on list items can also be updated through the DOM
+        items = [node for node in doc.headlines[0].as_dom() if isinstance(node, dom.ListGroupNode)][0]
+        dom_link = [tok for tok in items.children[0].content if isinstance(tok, org_rw.Link)][0]
+        dom_link.value = "e-updated"
+
+        self.assertEqual(
+            dumps(doc),
+            "* Links\n  [[a]] [[b][B]] [[c-updated]] [[d-updated]]\n  - Item with [[e-updated][E]]\n",
+        )
+
+    def test_insert_lines(self):
+        doc = loads("* First\n  Intro.\n  - a\n  - c\n  | 1 |\n  | 3 |\n  Outro.")
+        hl = doc.headlines[0]
+        hl.insert_lines("  - b", after=hl.get_lists()[0][0])
+        hl.insert_lines("  | 2 |", before=hl.get_tables()[0][1])
+
+        # Many insertions on the same place, without room for integer lines
+        intro = hl.contents[0]
+        for i in range(20):
+            hl.insert_lines("  Line {}".format(i), after=intro)
+
+        hl.insert_lines("  #+BEGIN_SRC python\n  print(1)\n  #+END_SRC\n  #+RESULTS:\n  : 1")
+
+        self.assertEqual([[item.content for item in lst] for lst in hl.get_lists()],
+                         [[["a"], ["b"], ["c"]]])
+        self.assertEqual([[row.cells for row in table] for table in hl.get_tables()],
+                         [[[" 1 "], [" 2 "], [" 3 "]]])
+        self.assertEqual([(s.content, s.result) for s in hl.get_code_snippets()], [("  print(1)", "1")])
+        self.assertEqual(
+            dumps(doc),
+            "* First\n  Intro.\n"
+            + "".join("  Line {}\n".format(i) for i in reversed(range(20)))
+            + "  - a\n  - b\n  - c\n  | 1 |\n  | 2 |\n  | 3 |\n  Outro.\n"
+            + "  #+BEGIN_SRC python\n  print(1)\n  #+END_SRC\n  #+RESULTS:\n  : 1",
+        )
+
+    def test_move_elements(self):
+        doc = loads("* First\n  #+KEYWORD: value\n  - One\n  Two.")
+        hl = doc.headlines[0]
+        keyword = hl.keywords[0]
+        two = hl.contents[-1]
+
+        moved = hl.move_element(keyword, after=two)
+        self.assertEqual(moved.value, "value")
+        hl.remove_element(hl.list_items[0])
+        self.assertEqual(dumps(doc), "* First\n  Two.\n  #+KEYWORD: value")
+        with self.assertRaises(ValueError):
+            hl.remove_element(keyword)
+
+    def test_move_headlines(self):
+        doc = loads("* A\n** A1\n*** A1a\n* B")
+        a1 = doc.headlines[0].children[0]
+        b = doc.headlines[1]
+
+        a1.move_to(doc, 0)
+        b.move_to(a1)
+        self.assertEqual(dumps(doc), "* A1\n** A1a\n** B\n* A")
+        self.assertEqual(b.doc, doc)
+
+        with self.assertRaises(ValueError):
+            a1.move_to(b)
+
+        other = loads("* Other")
+        a1.move_to(other.headlines[0])
+        self.assertEqual(dumps(doc), "* A")
+        self.assertEqual(dumps(other), "* Other\n** A1\n*** A1a\n*** B")
+
+    def test_links_cache(self):
+        doc = loads("* Links\n  [[a][A]] and https://example.com\n  - Item with [[b]]\n")
+        hl = doc.headlines[0]
+        links = list(hl.get_links())
+        self.assertEqual([link.value for link in links], ["a", "https://example.com", "b"])
+        self.assertEqual([id(link) for link in hl.get_links()], [id(link) for link in links])
+
+        # Edits on links, texts or list items drop the cached ones
+        links[0].value = "a-updated"
+        links[2].value = "b-updated"
+        self.assertEqual([link.value for link in hl.get_links()],
+                         ["a-updated", "https://example.com", "b-updated"])
+
+        hl.contents[0].contents.append(" and http://example.org")
+        hl.list_items[0].content = ["No links"]
+        self.assertEqual([link.value for link in hl.get_links()],
+                         ["a-updated", "https://example.com", "http://example.org"])
+
+    def test_zero_copy(self):
+        with open(os.path.join(DIR, "04-code.org")) as f:
+            orig = f.read()
+        self.assertEqual(dumps(loads(orig, zero_copy=True)), orig)
+
+        src = "* Text\n  Some [[a][link]]\n  - Item\n\n  More text\n"
+        doc = loads(src, zero_copy=True)
+        hl = doc.headlines[0]
+        self.assertEqual(hl.contents[0].get_raw(), "  Some [[a][link]]")
+        self.assertIsNone(hl.list_items[0].match)
+        self.assertEqual([link.value for link in hl.get_links()], ["a"])
+
+        # Read texts are tokenized, and can be edited as usual
+        hl.contents[0].contents.append(" edited")
+        self.assertEqual(dumps(doc), src.replace("[[a][link]]", "[[a][link]] edited"))
+
+    def test_load_include(self):
+        src = "\n".join([
+            "* Headline",
+            "  SCHEDULED: <2020-12-01 Tue>",
+            "  :PROPERTIES:",
+            "  :ID:       hl-id",
+            "  :CREATED:  [2020-11-30 Mon]",
+            "  :END:",
+            "  - Item with [[a][link]]",
+            "    continued",
+            "  | a | b |",
+        ])
+
+        doc = loads(src, include={"properties", "planning", "tables"})
+        hl = doc.headlines[0]
+        self.assertEqual(hl.id, "hl-id")
+        self.assertIsInstance(hl.get_property("CREATED"), org_rw.OrgTime)
+        self.assertEqual(hl.scheduled.to_raw(), "<2020-12-01 Tue>")
+        self.assertEqual(hl.list_items[0].content, ["Item with [[a][link]]", "\n    continued"])
+        self.assertEqual(dumps(doc), src)
+
+        doc = loads(src, include={"links"})
+        hl = doc.headlines[0]
+        self.assertEqual(hl.get_property("CREATED"), "[2020-11-30 Mon]")
+        self.assertIsNone(hl.scheduled)
+        self.assertEqual([link.value for link in hl.get_links()], ["a"])
+        self.assertEqual(hl.get_tables(), [])
+        with self.assertRaises(org_rw.PartialDocument):
+            dumps(doc)
+
+        with self.assertRaises(ValueError):
+            loads(src, include={"everything"})
+
+    def test_todo_keywords(self):
+        doc = loads("\n".join([
+            "#+TODO: NEXT(n) WAITING(w@/!) | FINISHED(f!)",
+            "#+SEQ_TODO: REVIEW DONE",
+            "#+typ_todo: Alice Bob",
+            "* NEXT First",
+            "* WAITING Second",
+            "* FINISHED Third",
+            "* DONE Fourth",
+            "* Bob Fifth",
+            "* Alice Sixth",
+            "* TODO Seventh",
+        ]))
+
+        self.assertEqual(doc.todo_keywords, ["NEXT", "WAITING", "REVIEW", "Alice"])
+        self.assertEqual(doc.done_keywords, ["FINISHED", "DONE", "Bob"])
+        self.assertEqual(
+            [(hl.state, hl.title.get_raw(), hl.is_todo, hl.is_done) for hl in doc.headlines],
+            [
+                ("NEXT", "First", True, False),
+                ("WAITING", "Second", True, False),
+                ("FINISHED", "Third", False, True),
+                ("DONE", "Fourth", False, True),
+                ("Bob", "Fifth", False, True),
+                ("Alice", "Sixth", True, False),
+                (None, "TODO Seventh", False, False),
+            ],
+        )
+
+        # A state on both lists is a TODO one
+        doc = loads("#+TODO: A | B\n#+TODO: B | C\n* B Headline")
+        self.assertEqual((doc.todo_keywords, doc.done_keywords), (["A", "B"], ["C"]))
+        self.assertTrue(doc.headlines[0].is_todo)
+
+    def test_skipped_headline_levels(self):
+        src = "** Starts deep\n*** Child\n* Top\n*** Skip\n** Back"
+        for extra_cautious in (False, True):
+            doc = loads(src, extra_cautious=extra_cautious)
+            self.assertEqual(
+                [(hl.depth, hl.title.get_raw(), [child.title.get_raw() for child in hl.children])
+                 for hl in doc.headlines],
+                [(2, "Starts deep", ["Child"]), (1, "Top", ["Skip", "Back"])],
+            )
+            self.assertEqual(dumps(doc), src)
+
     def test_mimic_write_file_04(self):
         with open(os.path.join(DIR, "04-code.org")) as f:
             orig = f.read()
@@ -495,6 +738,42 @@ class TestSerde(unittest.TestCase):
             + 'main(){}',
         )
 
+    def test_code_snippet_index(self):
+        doc = loads("""* Config
+#+BEGIN_SRC python :tangle init.py
+print(1)
+#+END_SRC
+
+#+RESULTS:
+: 1
+
+#+BEGIN_SRC shell :tangle no
+echo 2
+#+END_SRC
+
+#+RESULTS:
+: 2
+** Nested
+#+BEGIN_SRC python :tangle init.py :mkdirp yes
+print(3)
+#+END_SRC
+""")
+        snippets = list(doc.get_code_snippets())
+        self.assertEqual([s.content for s in snippets], ["print(1)", "echo 2", "print(3)"])
+        self.assertEqual([s.result for s in snippets], ["1", "2", None])
+        self.assertEqual(snippets[2].language, "python")
+        self.assertEqual(snippets[2].header_arguments, {"tangle": "init.py", "mkdirp": "yes"})
+
+        index = doc.get_code_snippet_index()
+        self.assertIs(doc.get_code_snippet_index(), index)
+        self.assertEqual([s.content for s in index.get_by_tangle("init.py")], ["print(1)", "print(3)"])
+        self.assertEqual([s.content for s in index.get_by_language("shell")], ["echo 2"])
+        self.assertEqual(index.get_by_tangle("no"), [])
+
+        # Changes on any headline rebuild the index
+        doc.headlines[0].children[0].create_headline_at_end()
+        self.assertIsNot(doc.get_code_snippet_index(), index)
+
     def test_mimic_write_file_05(self):
         with open(os.path.join(DIR, "05-dates.org")) as f:
             orig = f.read()
@@ -633,6 +912,11 @@ class TestSerde(unittest.TestCase):
         self.assertEqual(lists4[1][0].content, ["This is another", "\n    multiline list", "\n"])
         self.assertEqual(lists4[1][0].bullet, "-")
 
+        # Groups are cached until the headline changes
+        self.assertIs(hl4.get_lists(), lists4)
+        hl4.list_items.pop()
+        self.assertEqual(len(hl4.get_lists()), 1)
+
     def test_org_roam_07(self):
         with open(os.path.join(DIR, "07-org-roam-v2.org")) as f:
             orig = f.read()
@@ -787,6 +1071,37 @@ class TestSerde(unittest.TestCase):
         self.assertEqual(children[3].children[0].content, ['2.1'])
         self.assertEqual(children[3].children[1].content, ['2.2'])
 
+    def test_nested_lists_events_file_11(self):
+        with open(os.path.join(DIR, "11-nested-lists.org")) as f:
+            doc = load(f)
+
+        hl = doc.getTopHeadlines()[0]
+
+        events = [(event, node) for event, node in hl.iter_dom()
+                  if not isinstance(node, (dom.PropertyDrawerNode, dom.PropertyNode))]
+        kinds = [
+            (event.name, type(node).__name__)
+            for event, node in events
+        ]
+        self.assertEqual(kinds, [
+            ('ENTER', 'ListGroupNode'),
+            ('LEAF', 'ListItem'),
+            ('ENTER', 'ListGroupNode'),
+            ('LEAF', 'ListItem'),
+            ('LEAF', 'ListItem'),
+            ('LEAVE', 'ListGroupNode'),
+            ('LEAF', 'ListItem'),
+            ('ENTER', 'ListGroupNode'),
+            ('LEAF', 'ListItem'),
+            ('LEAF', 'ListItem'),
+            ('LEAVE', 'ListGroupNode'),
+            ('LEAF', 'ListItem'),
+            ('LEAVE', 'ListGroupNode'),
+        ])
+
+        # Nodes are streamed, not attached to their parents
+        self.assertEqual(events[0][1].children, [])
+
     def test_mimic_write_file_12(self):
         with open(os.path.join(DIR, "12-headlines-with-skip-levels.org")) as f:
             orig = f.read()
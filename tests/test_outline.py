@@ -0,0 +1,56 @@
+import os
+import unittest
+
+from org_rw import load
+from org_rw.outline import load_outline, loads_outline
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestOutline(unittest.TestCase):
+    def test_outline(self):
+        entries = loads_outline("""#+TODO: NEXT WAITING | FINISHED
+Preamble
+* NEXT First :work:
+  SCHEDULED: <2020-12-01 Tue>
+  :PROPERTIES:
+  :ID:       first-id
+  :EFFORT:   30
+  :END:
+  #+BEGIN_SRC org
+* Not a headline
+  #+END_SRC
+** FINISHED Second
+  :PROPERTIES:
+  :ID: second-id
+  :END:
+*** TODO Third :a:b:
+  Some text
+  :PROPERTIES:
+  :ID: ignored, not after the headline
+  :END:""")
+
+        self.assertEqual([tuple(entry) for entry in entries], [
+            (3, 1, "NEXT", "First ", ["work"], {"ID": "first-id", "EFFORT": "30"}),
+            (12, 2, "FINISHED", "Second", [], {"ID": "second-id"}),
+            (16, 3, None, "TODO Third ", ["a", "b"], {}),
+        ])
+        self.assertEqual(entries[0].id, "first-id")
+        self.assertIsNone(entries[2].id)
+
+    def test_same_as_load(self):
+        for name in sorted(os.listdir(DIR)):
+            if not name.endswith(".org"):
+                continue
+            with open(os.path.join(DIR, name)) as f:
+                doc = load(f)
+            with open(os.path.join(DIR, name)) as f:
+                entries = load_outline(f)
+
+            self.assertEqual(
+                [(entry.linenum, entry.depth, entry.state, entry.title, entry.tags, entry.id)
+                 for entry in entries],
+                [(hl.start_line, hl.depth, hl.state, hl.title.get_raw(), hl.shallow_tags, hl.id)
+                 for hl in doc.getAllHeadlines()],
+                name,
+            )
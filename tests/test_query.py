@@ -0,0 +1,63 @@
+import os
+import unittest
+from datetime import date
+
+from org_rw import load
+from org_rw.query import (HeadlineIndex, deadline_before, done, headline_id,
+                          prop, scheduled_before, tags, title_contains, todo)
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(DIR, "13-query.org")) as f:
+            self.doc = load(f)
+
+    def titles(self, headlines):
+        return [hl.title.get_text().strip() for hl in headlines]
+
+    def test_simple_predicates(self):
+        self.assertEqual(self.titles(todo().run(self.doc)),
+                         ["Write report", "Collect numbers", "Buy groceries"])
+        self.assertEqual(self.titles(todo("NEXT").run(self.doc)), ["Buy groceries"])
+        self.assertEqual(self.titles(done().run(self.doc)), ["Draft outline"])
+        self.assertEqual(self.titles(headline_id("13-query-report").run(self.doc)),
+                         ["Write report"])
+
+    def test_inherited_tags(self):
+        self.assertEqual(self.titles(tags("work").run(self.doc)),
+                         ["Write report", "Collect numbers", "Draft outline", "Notes"])
+
+    def test_combined_query(self):
+        query = (todo("TODO") & tags("work")
+                 & scheduled_before(date(2021, 1, 31))
+                 & (prop("EFFORT") > 30))
+        self.assertEqual(self.titles(query.run(self.doc)), ["Write report"])
+
+        query = (prop("EFFORT") >= 45) | deadline_before(date(2021, 1, 4))
+        self.assertEqual(self.titles(query.run(self.doc)),
+                         ["Write report", "Buy groceries"])
+
+        query = tags("work") & ~todo()
+        self.assertEqual(self.titles(query.run(self.doc)), ["Draft outline", "Notes"])
+
+    def test_plan_uses_index(self):
+        index = HeadlineIndex(self.doc)
+        query = tags("work") & todo() & title_contains("numbers")
+        plan = query.compile(index)
+        self.assertEqual(len(plan.indexed), 2)
+        self.assertEqual(len(plan.filtered), 1)
+        self.assertEqual(self.titles(plan.execute()), ["Collect numbers"])
+
+        explanation = query.explain(self.doc)
+        self.assertIn("build index over 5 headlines", explanation)
+        self.assertIn('index  tags("work")', explanation)
+        self.assertIn('filter title_contains("numbers") [2 -> 1]', explanation)
+
+    def test_scan_fallback(self):
+        query = ~tags("home")
+        plan = query.compile(HeadlineIndex(self.doc))
+        self.assertEqual(len(plan.indexed), 0)
+        self.assertEqual(len(plan.execute()), 4)
+        self.assertEqual(plan.steps[0].kind, "scan")
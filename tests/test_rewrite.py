@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from org_rw.rewrite import new_target, rewrite_links
+
+LINKED = """Before the headlines: [[id:old-id][old]]
+* First [[file:old.org][title link]]
+  See [[file:old.org::*Heading][heading]] and [[id:old-id]].
+  - Item on [[id:old-id][a list]]
+** Unrelated
+  [[https://example.com][example]] and [[id:other-id]].
+"""
+
+UNLINKED = """* Nothing to see
+  [[id:other-id][other]]
+"""
+
+
+class TestRewrite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for name, contents in (("linked.org", LINKED), ("unlinked.org", UNLINKED)):
+            with open(os.path.join(self.tmp, name), "w") as f:
+                f.write(contents)
+        self.mapping = {"file:old.org": "file:new.org", "id:old-id": "id:new-id"}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def read(self, name):
+        with open(os.path.join(self.tmp, name)) as f:
+            return f.read()
+
+    def test_new_target(self):
+        self.assertEqual(new_target("file:old.org", self.mapping), "file:new.org")
+        self.assertEqual(new_target("file:old.org::*Heading", self.mapping), "file:new.org::*Heading")
+        self.assertIsNone(new_target("file:old.org.bak", self.mapping))
+
+    def test_rewrite_links(self):
+        unlinked_mtime = os.stat(os.path.join(self.tmp, "unlinked.org")).st_mtime_ns
+
+        result = rewrite_links([self.tmp], self.mapping, jobs=2)
+        self.assertEqual(result.files_scanned, 2)
+        self.assertEqual(result.files_changed, 1)
+        self.assertEqual(result.links_rewritten, 4)
+        self.assertEqual(result.links_skipped, 1)
+        self.assertEqual(result.errors, [])
+
+        self.assertEqual(self.read("linked.org"), LINKED.replace(
+            "* First [[file:old.org]", "* First [[file:new.org]"
+        ).replace(
+            "See [[file:old.org::", "See [[file:new.org::"
+        ).replace(
+            "and [[id:old-id]]", "and [[id:new-id]]"
+        ).replace(
+            "Item on [[id:old-id]", "Item on [[id:new-id]"
+        ))
+        self.assertEqual(self.read("unlinked.org"), UNLINKED)
+        self.assertEqual(os.stat(os.path.join(self.tmp, "unlinked.org")).st_mtime_ns, unlinked_mtime)
+
+    def test_title_links(self):
+        with open(os.path.join(self.tmp, "titles.org"), "w") as f:
+            f.write("* First\n* Second [[id:old-id][x]]\n** Sub [[file:old.org]]\n")
+
+        result = rewrite_links([os.path.join(self.tmp, "titles.org")], self.mapping, jobs=1)
+        self.assertEqual(result.links_rewritten, 2)
+        self.assertEqual(result.links_skipped, 0)
+        self.assertEqual(self.read("titles.org"),
+                         "* First\n* Second [[id:new-id][x]]\n** Sub [[file:new.org]]\n")
+
+    def test_dry_run(self):
+        result = rewrite_links([self.tmp], self.mapping, jobs=1, dry_run=True)
+        self.assertEqual(result.links_rewritten, 4)
+        self.assertEqual(self.read("linked.org"), LINKED)
@@ -0,0 +1,96 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from org_rw.sqlite_export import export_corpus
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestSqliteExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.paths = []
+        for name in ("01-simple.org", "03-links.org", "05-dates.org", "13-query.org"):
+            shutil.copy(os.path.join(DIR, name), self.tmp)
+            self.paths.append(os.path.join(self.tmp, name))
+        self.db = os.path.join(self.tmp, "corpus.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def query(self, sql, *args):
+        with sqlite3.connect(self.db) as conn:
+            return conn.execute(sql, args).fetchall()
+
+    def test_export(self):
+        result = export_corpus(self.paths, self.db)
+        self.assertEqual(result.files_updated, 4)
+        self.assertEqual(result.headlines_deleted, 0)
+
+        self.assertEqual(
+            self.query("SELECT title, state, parent_key FROM headlines WHERE key = '13-query-report'"),
+            [("Write report", "TODO", "")],
+        )
+        self.assertEqual(
+            self.query("SELECT value FROM properties WHERE headline_key = '01-simple-first-level-id'"
+                       " AND key = 'CREATED'"),
+            [("[2020-01-01 Wed 01:01]",)],
+        )
+        self.assertEqual(
+            self.query("SELECT COUNT(*) FROM links WHERE target LIKE 'https://codigoparallevar.com/%'"),
+            [(6,)],
+        )
+        self.assertEqual(
+            self.query("SELECT kind, start FROM timestamps WHERE headline_key = '13-query-report'"),
+            [("scheduled", "2021-01-10 00:00")],
+        )
+        self.assertEqual(
+            self.query("SELECT tag, inherited FROM tags WHERE headline_key = '#1.1'"
+                       " AND file_id = (SELECT id FROM files WHERE path LIKE '%13-query.org')"),
+            [("work", 1)],
+        )
+
+    def test_incremental_export(self):
+        export_corpus(self.paths, self.db)
+        before = self.query("SELECT COUNT(*) FROM headlines")
+
+        result = export_corpus(self.paths, self.db)
+        self.assertEqual((result.files_skipped, result.files_updated), (4, 0))
+
+        path = os.path.join(self.tmp, "13-query.org")
+        with open(path) as f:
+            contents = f.read()
+        with open(path, "w") as f:
+            f.write(contents.replace("Buy groceries", "Buy more groceries"))
+
+        result = export_corpus(self.paths, self.db)
+        self.assertEqual((result.files_skipped, result.files_updated), (3, 1))
+        self.assertEqual((result.headlines_inserted, result.headlines_deleted), (1, 1))
+        self.assertEqual(result.headlines_unchanged, 5)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM headlines"), before)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM headlines WHERE title = 'Buy more groceries'"),
+                         [(1,)])
+
+        result = export_corpus(self.paths[:1], self.db, prune=True)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM files"), [(1,)])
+        self.assertEqual(self.query("SELECT COUNT(DISTINCT file_id) FROM properties"), [(1,)])
+
+    def test_moved_headlines(self):
+        export_corpus(self.paths, self.db)
+        path = os.path.join(self.tmp, "13-query.org")
+        sql = ("SELECT key, start_line FROM headlines WHERE key != ''"
+               " AND file_id = (SELECT id FROM files WHERE path = ?) ORDER BY key")
+        lines = self.query(sql, path)
+
+        with open(path) as f:
+            contents = f.read()
+        with open(path, "w") as f:
+            f.write("# A new first line\n" + contents)
+
+        result = export_corpus(self.paths, self.db)
+        self.assertEqual((result.headlines_inserted, result.headlines_deleted), (0, 0))
+        self.assertEqual(result.headlines_unchanged, 6)
+        self.assertEqual(self.query(sql, path), [(key, line + 1) for key, line in lines])
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+import org_rw
+from org_rw.stats import LoadStats, collect_load_stats
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestLoadStats(unittest.TestCase):
+    def test_stats_on_loads(self):
+        with open(os.path.join(DIR, "04-code.org")) as f:
+            orig = f.read()
+
+        stats = LoadStats()
+        org_rw.loads(orig, stats=stats)
+
+        self.assertEqual(stats.documents, 1)
+        self.assertEqual(stats.bytes, len(orig))
+        self.assertEqual(stats.lines, len(orig.split("\n")))
+        self.assertEqual(sum(stats.line_types.values()), stats.lines)
+        self.assertEqual(stats.line_types["headline"], 3)
+        self.assertEqual(stats.line_types["begin_block"], 3)
+        self.assertEqual(stats.line_types["end_block"], 3)
+
+        for phase in ("read", "build", "verify"):
+            self.assertEqual(stats.phases[phase].calls, 1)
+        self.assertGreater(stats.phases["tokenize"].calls, 0)
+        self.assertGreaterEqual(stats.seconds, stats.phases["read"].seconds)
+
+        metrics = stats.to_metrics()
+        self.assertEqual(metrics["org_rw.load.lines.headline"], 3)
+        self.assertEqual(metrics["org_rw.load.phase.read.calls"], 1)
+
+    def test_collect_stats_context(self):
+        with collect_load_stats() as stats:
+            for name in ("01-simple.org", "05-dates.org"):
+                with open(os.path.join(DIR, name)) as f:
+                    org_rw.load(f)
+
+        self.assertEqual(stats.documents, 2)
+        self.assertEqual(stats.phases["verify"].calls, 0)
+
+        # Nothing is collected outside of the block
+        with open(os.path.join(DIR, "01-simple.org")) as f:
+            org_rw.load(f)
+        self.assertEqual(stats.documents, 2)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from org_rw import loads
+from org_rw.tangle import tangle
+
+FIRST = """* Config
+#+BEGIN_SRC python :tangle out/config.py :mkdirp yes
+import os
+#+END_SRC
+
+#+BEGIN_SRC shell :tangle no
+echo skipped
+#+END_SRC
+** Nested
+#+BEGIN_SRC python :tangle out/config.py
+print(os.getcwd())
+#+END_SRC
+"""
+
+SECOND = """* More
+#+BEGIN_SRC python :tangle out/config.py
+print("second")
+#+END_SRC
+
+#+BEGIN_SRC shell :tangle yes
+echo hi
+#+END_SRC
+"""
+
+
+class TestTangle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for name, contents in (("first.org", FIRST), ("second.org", SECOND)):
+            with open(os.path.join(self.tmp, name), "w") as f:
+                f.write(contents)
+        self.paths = [os.path.join(self.tmp, "first.org"), os.path.join(self.tmp, "second.org")]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def read(self, *path):
+        with open(os.path.join(self.tmp, *path)) as f:
+            return f.read()
+
+    def test_tangle_corpus(self):
+        result = tangle(self.paths, jobs=2)
+        self.assertEqual(sorted(result.written), [
+            os.path.join(self.tmp, "out", "config.py"),
+            os.path.join(self.tmp, "second.sh"),
+        ])
+        self.assertEqual(result.unchanged, [])
+        self.assertEqual(self.read("out", "config.py"),
+                         'import os\n\nprint(os.getcwd())\n\nprint("second")\n')
+        self.assertEqual(self.read("second.sh"), "echo hi\n")
+
+        # Nothing is written again if the contents didn't change
+        result = tangle(self.paths, jobs=1)
+        self.assertEqual(result.written, [])
+        self.assertEqual(len(result.unchanged), 2)
+
+    def test_tangle_document(self):
+        doc = loads(FIRST)
+        result = tangle(doc, self.tmp)
+        self.assertEqual(result.written, [os.path.join(self.tmp, "out", "config.py")])
+        self.assertEqual(self.read("out", "config.py"), "import os\n\nprint(os.getcwd())\n")
+
+    def test_same_target_written_differently(self):
+        doc = loads("""* Blocks
+#+BEGIN_SRC python :tangle ./out.py
+first = 1
+#+END_SRC
+
+#+BEGIN_SRC python :tangle out.py
+second = 2
+#+END_SRC
+
+#+BEGIN_SRC python :tangle ./out.py
+third = 3
+#+END_SRC
+""")
+        result = tangle(doc, self.tmp)
+        self.assertEqual(result.written, [os.path.join(self.tmp, "out.py")])
+        self.assertEqual(self.read("out.py"), "first = 1\n\nsecond = 2\n\nthird = 3\n")